@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+RPE Anomaly Detection
+Keeps running per-player statistics and scores only responses that arrived
+since the last ingest, so each ingest costs the same however long the season
+runs. A response is flagged when it sits far above the player's own baseline
+(z-score against an exponentially weighted mean and variance) or when it
+pushes the player's acute:chronic ratio past the danger threshold.
+
+State and recent alerts are shared by every worker through a JSON file
+kept next to the response archive. It must outlive the render cache, whose
+files expire after an idle hour; losing it would re-raise every old alert.
+"""
+
+import fcntl
+import json
+import math
+import os
+from datetime import datetime
+
+import pandas as pd
+
+import archive
+
+STATE_FILE = archive.ARCHIVE_DIR / 'anomalies.json'
+
+# Baseline: exponentially weighted over roughly the last BASELINE_SPAN responses
+BASELINE_SPAN = 10
+# Standard deviation floor so a player who always logs the same RPE isn't flagged for +1
+MIN_STD = 0.75
+# Responses needed before a player's baseline is trusted
+MIN_HISTORY = 5
+Z_THRESHOLD = 2.0
+
+# Acute and chronic loads decay with elapsed time, matching the 7D/28D windows on player pages
+ACUTE_DAYS = 7
+CHRONIC_DAYS = 28
+ACWR_THRESHOLD = 1.5
+
+# Only the newest alerts are kept, so the state file doesn't grow with the season
+MAX_ALERTS = 500
+
+
+def empty_state():
+    # 'watermark' is the latest submission Timestamp scored; 'watermark_keys' are
+    # the responses scored at exactly that time, since several can share a second
+    return {'watermark': None, 'watermark_keys': [], 'players': {}, 'alerts': []}
+
+
+def read_state():
+    try:
+        with open(STATE_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return empty_state()
+
+
+def _write_state(state):
+    tmp_path = STATE_FILE.with_name(f"{STATE_FILE.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, STATE_FILE)
+
+
+def new_rows(df, state):
+    """Responses submitted after the watermark, in submission order"""
+    submitted = df[df['timestamp'].notna()]
+    if state['watermark'] is not None:
+        watermark = pd.Timestamp(state['watermark'])
+        is_new = submitted['timestamp'] > watermark
+        # Only responses sharing the watermark's second need the per-row check
+        seen = set(map(tuple, state['watermark_keys']))
+        tied = submitted[submitted['timestamp'] == watermark]
+        unseen = [index for index, player, session in zip(tied.index, tied['player'], tied['session_key'])
+                  if (player, session) not in seen]
+        submitted = submitted[is_new | submitted.index.isin(unseen)]
+    return submitted.sort_values('timestamp', kind='stable')
+
+
+def score(stats, rpe, when):
+    """Fold one response into a player's running statistics.
+
+    Returns the response's z-score against the baseline before it, and the
+    player's ACWR after it. Either is None until enough history exists.
+    """
+    z = None
+    if stats['count'] >= MIN_HISTORY:
+        z = (rpe - stats['mean']) / max(math.sqrt(stats['var']), MIN_STD)
+
+    # Exponentially weighted mean and variance (West's incremental form)
+    if stats['count'] == 0:
+        stats['mean'], stats['var'] = rpe, 0.0
+    else:
+        alpha = 2 / (BASELINE_SPAN + 1)
+        diff = rpe - stats['mean']
+        increment = alpha * diff
+        stats['mean'] += increment
+        stats['var'] = (1 - alpha) * (stats['var'] + diff * increment)
+
+    # Time-decayed loads; late submissions for an earlier session don't rewind the clock
+    last_time = pd.Timestamp(stats['last_time']) if stats['last_time'] else None
+    if last_time is None:
+        stats['acute'] = stats['chronic'] = rpe
+        stats['first_time'] = when.isoformat()
+    else:
+        days = max(0.0, (when - last_time).total_seconds() / 86400)
+        # At least one response's worth of weight, even for two sessions on one day
+        acute_weight = max(1 - math.exp(-days / ACUTE_DAYS), 2 / (2 * ACUTE_DAYS + 1))
+        chronic_weight = max(1 - math.exp(-days / CHRONIC_DAYS), 2 / (2 * CHRONIC_DAYS + 1))
+        stats['acute'] += acute_weight * (rpe - stats['acute'])
+        stats['chronic'] += chronic_weight * (rpe - stats['chronic'])
+    stats['last_time'] = (max(when, last_time) if last_time is not None else when).isoformat()
+    stats['count'] += 1
+
+    # The ratio is noise until the chronic load spans a full window
+    acwr = None
+    history_days = (when - pd.Timestamp(stats['first_time'])).total_seconds() / 86400
+    if history_days >= CHRONIC_DAYS and stats['chronic'] > 0:
+        acwr = stats['acute'] / stats['chronic']
+    return z, acwr
+
+
+def ingest(df):
+    """Score responses submitted since the last ingest and return the alerts they raised"""
+    STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    raised = []
+    with open(STATE_FILE.with_suffix('.lock'), 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            state = read_state()
+            rows = new_rows(df, state)
+            if rows.empty:
+                return []
+
+            detected_at = datetime.now().isoformat(timespec='seconds')
+            for player, session_key, rpe, when in zip(rows['player'], rows['session_key'],
+                                                      rows['rpe'], rows['timestamp']):
+                # Keyed case-insensitively, like the ingest stage folds name spellings
+                stats = state['players'].setdefault(player.casefold(), {
+                    'player': player, 'count': 0, 'mean': 0.0, 'var': 0.0,
+                    'acute': 0.0, 'chronic': 0.0, 'first_time': None, 'last_time': None,
+                })
+                baseline = stats['mean']
+                z, acwr = score(stats, float(rpe), when)
+
+                reasons = []
+                if z is not None and z >= Z_THRESHOLD:
+                    reasons.append(f"RPE {rpe:g} is {z:.1f} SD above baseline {baseline:.1f}")
+                if acwr is not None and acwr >= ACWR_THRESHOLD:
+                    reasons.append(f"ACWR {acwr:.2f} above {ACWR_THRESHOLD}")
+                if reasons:
+                    raised.append({
+                        'player': stats['player'],
+                        'session_key': session_key,
+                        'rpe': float(rpe),
+                        'baseline': round(baseline, 2),
+                        'z': round(z, 2) if z is not None else None,
+                        'acwr': round(acwr, 2) if acwr is not None else None,
+                        'reasons': reasons,
+                        'submitted_at': when.isoformat(),
+                        'detected_at': detected_at,
+                    })
+
+            watermark = rows['timestamp'].iloc[-1]
+            at_watermark = rows[rows['timestamp'] == watermark]
+            keys = list(zip(at_watermark['player'], at_watermark['session_key']))
+            if state['watermark'] is not None and pd.Timestamp(state['watermark']) == watermark:
+                keys += [tuple(k) for k in state['watermark_keys']]
+            state['watermark'] = watermark.isoformat()
+            state['watermark_keys'] = [list(k) for k in keys]
+            state['alerts'] = (state['alerts'] + raised)[-MAX_ALERTS:]
+            _write_state(state)
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    return raised
+
+
+def recent_alerts(player=None, since=None, limit=100, state=None):
+    """Newest alerts first, optionally for one player or sessions on/after a date"""
+    alerts = (state or read_state())['alerts']
+    if player is not None:
+        alerts = [a for a in alerts if a['player'].casefold() == player.casefold()]
+    if since is not None:
+        alerts = [a for a in alerts if a['session_key'] >= since]
+    return list(reversed(alerts))[:limit]
+
+
+def flagged_sessions(alerts):
+    """(player, session_key) pairs to highlight on the charts"""
+    return {(a['player'], a['session_key']) for a in alerts}
@@ -4,165 +4,142 @@ CofC Men's Soccer RPE Dashboard Web App
 On-demand RPE visualization for coaches
 """
 
-from flask import Flask, render_template, send_file, jsonify
+from flask import Flask, render_template, send_file, send_from_directory, jsonify, request, make_response, Response, abort
 import pandas as pd
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 import seaborn as sns
 import numpy as np
 from pathlib import Path
 import requests
-from io import StringIO, BytesIO
+from io import BytesIO
 import base64
+import gc
+import hashlib
 from datetime import datetime, timezone, timedelta
 import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import anomalies
+import archive
+import chart_backends
+import chart_variants
+import compression
+import diagnostics
+import export
+import ingest
+import player_heatmap
+import singleflight
+from ingest import format_session_label
 
 app = Flask(__name__)
+compression.init_app(app)
+diagnostics.init_app(app)
 
 # Configuration
-GOOGLE_SHEET_URL = "https://docs.google.com/spreadsheets/d/1kSXC_tY9KbGYsRLiFdvpPOyLp0GAxxCECrdOwTEaNEM/export?format=csv"
+# Set GOOGLE_SHEET_URL to point at another export, e.g. mock_sheet_server.py for load tests
+GOOGLE_SHEET_URL = os.environ.get(
+    'GOOGLE_SHEET_URL',
+    "https://docs.google.com/spreadsheets/d/1kSXC_tY9KbGYsRLiFdvpPOyLp0GAxxCECrdOwTEaNEM/export?format=csv"
+)
 
-def load_data():
-    """Load data from Google Sheet"""
-    try:
-        response = requests.get(GOOGLE_SHEET_URL, timeout=10)
+# Last download per URL, revalidated with If-None-Match when the server sends ETags
+_last_sheet = {}
+
+def fetch_sheet():
+    """Download the sheet CSV, sharing one download between concurrent requests"""
+    url = GOOGLE_SHEET_URL
+    
+    def download():
+        previous = _last_sheet.get(url)
+        headers = {'If-None-Match': previous['etag']} if previous else {}
+        response = requests.get(url, timeout=10, headers=headers)
+        if response.status_code == 304 and previous:
+            return previous['sheet']
         response.raise_for_status()
-        df = pd.read_csv(StringIO(response.text))
-        data_source = "Google Sheet"
+        
+        sheet = {
+            'csv_text': response.text,
+            'version': hashlib.sha1(response.content).hexdigest()
+        }
+        if response.headers.get('ETag'):
+            _last_sheet[url] = {'etag': response.headers['ETag'], 'sheet': sheet}
+        return sheet
+    
+    return singleflight.do(f"sheet:{url}", download)
+
+def parse_data(csv_text):
+    """Parse sheet CSV text into the clean, deduped responses frame"""
+    df, rejected = ingest.parse_responses(csv_text)
+    if len(rejected):
+        print(f"Rejected {len(rejected)} sheet rows: {ingest.rejection_summary(rejected)}")
+    return df
+
+def load_sheet():
+    """Fetch the sheet and return its CSV text and data version"""
+    try:
+        sheet = fetch_sheet()
     except Exception as e:
         print(f"Could not load from Google Sheet: {e}")
         raise Exception(f"Failed to load data from Google Sheet: {e}")
-    
-    # Rename columns to concise snake-case
-    df = df.rename(columns={
-        'Timestamp': 'timestamp',
-        'Todays Date': 'date',
-        'Morning or Afternoon Session': 'session_period',
-        'Player Name': 'player',
-        'What is your rate of perceived exertion?': 'rpe',
-        'SessionKey': 'session_key'
-    })
-    
-    # Convert date to datetime and sort by date + session_period
-    df['date'] = pd.to_datetime(df['date'])
-    df['sort_key'] = df['date'] + pd.to_timedelta(df['session_period'].map({'Morning': 0, 'Afternoon': 12}), unit='hours')
-    df = df.sort_values('sort_key')
-    
-    return df, data_source
+    return sheet['csv_text'], sheet['version']
 
-def generate_avg_chart(df_filtered, all_sessions):
+def load_data():
+    """Load data from Google Sheet"""
+    csv_text, _ = load_sheet()
+    return parse_data(csv_text), "Google Sheet"
+
+def figure_to_base64(fig):
+    """Render a figure as a base64 PNG string"""
+    img_buffer = BytesIO()
+    fig.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight')
+    img_buffer.seek(0)
+    return base64.b64encode(img_buffer.getvalue()).decode()
+
+def close_figure(fig):
+    """Release a figure now instead of waiting for the cyclic garbage collector"""
+    plt.close(fig)  # No-op for figures pyplot doesn't manage
+    fig.clear()
+
+def average_rpe_by_session(df_filtered, all_sessions):
+    """Mean RPE per session, in session order (NaN where nobody logged)"""
+    return df_filtered.groupby('session_key')['rpe'].mean().reindex(all_sessions)
+
+def generate_avg_chart(df_filtered, all_sessions, save=figure_to_base64):
     """Generate average RPE chart"""
-    plt.figure(figsize=(10, 6))
-    avg_rpe = df_filtered.groupby('session_key')['rpe'].mean()
-    avg_rpe = avg_rpe.reindex(all_sessions)
+    fig = plt.figure(figsize=(10, 6))
+    avg_rpe = average_rpe_by_session(df_filtered, all_sessions)
     
     bars = plt.bar(range(len(avg_rpe)), avg_rpe.values, color='skyblue', alpha=0.7)
     plt.xlabel('Session')
     plt.ylabel('Average RPE')
     plt.title('Average RPE per Session')
     
-    # Create clean labels without problematic characters
-    clean_labels = []
-    for session in all_sessions:
-        try:
-            # Convert to string first to handle NaN values
-            session_str = str(session) if pd.notna(session) else "Unknown"
-            # Replace problematic en-dash with regular dash and split
-            clean_session = session_str.replace('â\x80\x93', '-').replace('–', '-')
-            
-            # Try different splitting patterns
-            if ' - ' in clean_session:
-                parts = clean_session.split(' - ')
-            elif ' – ' in clean_session:
-                parts = clean_session.split(' – ')
-            else:
-                parts = clean_session.split()
-            
-            if len(parts) >= 2:
-                date_str = parts[0]  # e.g., "2025-08-05"
-                period = parts[1]    # e.g., "Morning" or "Afternoon"
-                
-                # Clean the period string of any special characters
-                period_clean = ''.join(c for c in period if c.isalnum() or c.isspace()).strip()
-                
-                # Convert date to M/DD format and period to AM/PM
-                date_obj = pd.to_datetime(date_str)
-                formatted_date = date_obj.strftime('%-m/%d')  # %-m removes leading zero from month
-                
-                if 'Morning' in period_clean or 'AM' in period_clean:
-                    period_short = 'AM'
-                elif 'Afternoon' in period_clean or 'PM' in period_clean:
-                    period_short = 'PM'
-                else:
-                    period_short = 'AM' if period_clean.lower().startswith('m') else 'PM'
-                
-                clean_labels.append(f"{formatted_date} {period_short}")
-            else:
-                clean_labels.append(session_str[:8])
-        except:
-            clean_labels.append(f"S{len(clean_labels)+1}")
+    clean_labels = [format_session_label(s) for s in all_sessions]
     
     plt.xticks(range(len(avg_rpe)), clean_labels, rotation=45)
     plt.ylim(0, 10)
     plt.tight_layout()
     
     # Convert to base64 string
-    img_buffer = BytesIO()
-    plt.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight')
-    img_buffer.seek(0)
-    img_str = base64.b64encode(img_buffer.getvalue()).decode()
-    plt.close()
-    
-    return img_str
+    try:
+        return save(fig)
+    finally:
+        close_figure(fig)
 
-def generate_distribution_chart(df_filtered, all_sessions):
+def generate_distribution_chart(df_filtered, all_sessions, save=figure_to_base64):
     """Generate distribution chart"""
-    plt.figure(figsize=(10, 6))
+    fig = plt.figure(figsize=(10, 6))
     
-    session_data = []
-    session_labels = []
-    for session in all_sessions:
-        session_rpe = df_filtered[df_filtered['session_key'] == session]['rpe']
-        session_data.append(session_rpe)
-        
-        # Create clean labels in MM/DD AM/PM format
-        try:
-            # Convert to string first to handle NaN values
-            session_str = str(session) if pd.notna(session) else "Unknown"
-            clean_session = session_str.replace('â\x80\x93', '-').replace('–', '-')
-            
-            # Try different splitting patterns
-            if ' - ' in clean_session:
-                parts = clean_session.split(' - ')
-            elif ' – ' in clean_session:
-                parts = clean_session.split(' – ')
-            else:
-                parts = clean_session.split()
-            
-            if len(parts) >= 2:
-                date_str = parts[0]
-                period = parts[1]
-                
-                # Clean the period string
-                period_clean = ''.join(c for c in period if c.isalnum() or c.isspace()).strip()
-                
-                # Convert to M/DD AM/PM format
-                date_obj = pd.to_datetime(date_str)
-                formatted_date = date_obj.strftime('%-m/%d')  # %-m removes leading zero from month
-                
-                if 'Morning' in period_clean or 'AM' in period_clean:
-                    period_short = 'AM'
-                elif 'Afternoon' in period_clean or 'PM' in period_clean:
-                    period_short = 'PM'
-                else:
-                    period_short = 'AM' if period_clean.lower().startswith('m') else 'PM'
-                
-                session_labels.append(f"{formatted_date}\n{period_short}")
-            else:
-                session_labels.append(session_str[:8])
-        except:
-            session_labels.append(f"S{len(session_labels)+1}")
+    rpe_by_session = dict(tuple(df_filtered.groupby('session_key')['rpe']))
+    session_data = [rpe_by_session.get(session, pd.Series(dtype=float)) for session in all_sessions]
+    session_labels = [format_session_label(s, separator='\n') for s in all_sessions]
     
     box_plot = plt.boxplot(session_data, labels=session_labels, patch_artist=True)
     
@@ -179,158 +156,705 @@ def generate_distribution_chart(df_filtered, all_sessions):
     plt.grid(True, alpha=0.3)
     plt.tight_layout()
     
-    img_buffer = BytesIO()
-    plt.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight')
-    img_buffer.seek(0)
-    img_str = base64.b64encode(img_buffer.getvalue()).decode()
-    plt.close()
-    
-    return img_str
+    try:
+        return save(fig)
+    finally:
+        close_figure(fig)
 
-def generate_player_dashboard(df_filtered, all_sessions):
-    """Generate player dashboard"""
-    players = df_filtered['player'].unique()
-    
+def sort_players(players):
+    """Sort player names by the jersey number they start with"""
     def extract_player_number(player_name):
         try:
             return int(player_name.split()[0])
         except (ValueError, IndexError):
             return 999
     
-    players_sorted = sorted(players, key=extract_player_number)
+    return sorted(players, key=extract_player_number)
+
+# Player grid figures keyed by (roster, sessions); only the line data changes between renders
+PLAYER_TEMPLATE_CACHE_SIZE = 4
+_player_templates = OrderedDict()
+_player_templates_lock = threading.Lock()
+
+def build_player_template(players_sorted, all_sessions):
+    """Lay out the player grid once: axes, titles, ticks, grids and an empty line per player"""
     n_players = len(players_sorted)
+    n_sessions = len(all_sessions)
     cols = 4
     rows = (n_players + cols - 1) // cols
     
-    fig, axes = plt.subplots(rows, cols, figsize=(16, rows * 3))
-    if rows == 1:
-        axes = axes.reshape(1, -1)
-    elif cols == 1:
-        axes = axes.reshape(-1, 1)
-    
+    # Built outside pyplot so cached figures never become pyplot's "current" figure
+    fig = Figure(figsize=(16, rows * 3))
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(rows, cols, squeeze=False)
     axes_flat = axes.flatten()
     
+    session_labels = [format_session_label(s) for s in all_sessions]
+    
+    x = np.arange(n_sessions)
+    lines = {}
     for i, player in enumerate(players_sorted):
         ax = axes_flat[i]
         
-        player_data = df_filtered[df_filtered['player'] == player]
-        
-        player_complete = []
-        for session in all_sessions:
-            session_data = player_data[player_data['session_key'] == session]
-            if len(session_data) > 0:
-                player_complete.append({'session_key': session, 'rpe': session_data['rpe'].iloc[0]})
-            else:
-                player_complete.append({'session_key': session, 'rpe': np.nan})
-        
-        player_df = pd.DataFrame(player_complete)
-        
-        valid_data = player_df.dropna()
-        if len(valid_data) > 0:
-            ax.plot(range(len(all_sessions)), player_df['rpe'], 'o-', linewidth=2, markersize=6)
-            ax.set_ylim(0, 10)
+        # Plot real x positions so autoscaling sets the x range, then blank the values
+        line, = ax.plot(x, np.zeros(n_sessions), 'o-', linewidth=2, markersize=6)
+        ax.set_ylim(0, 10)
+        line.set_ydata(np.full(n_sessions, np.nan))
+        # Flagged sessions get a red ring drawn over the player's marker
+        alert_line, = ax.plot(x, np.full(n_sessions, np.nan), 'o', markersize=12,
+                              markerfacecolor='none', markeredgecolor='red', markeredgewidth=2, clip_on=False)
+        lines[player] = (line, alert_line)
         
         ax.set_title(player, fontsize=10, pad=10)
         ax.set_xlabel('Session', fontsize=8)
         ax.set_ylabel('RPE', fontsize=8)
-        ax.set_xticks(range(len(all_sessions)))
-        
-        # Create readable labels for x-axis in MM/DD AM/PM format
-        session_labels = []
-        for s in all_sessions:
-            try:
-                s_str = str(s) if pd.notna(s) else "Unknown"
-                clean_s = s_str.replace('â\x80\x93', '-').replace('–', '-')
-                
-                # Try different splitting patterns
-                if ' - ' in clean_s:
-                    parts = clean_s.split(' - ')
-                elif ' – ' in clean_s:
-                    parts = clean_s.split(' – ')
-                else:
-                    parts = clean_s.split()
-                
-                if len(parts) >= 2:
-                    date_str = parts[0]  # e.g., "2025-08-05"
-                    period = parts[1]    # e.g., "Morning" or "Afternoon"
-                    
-                    # Clean the period string of any special characters
-                    period_clean = ''.join(c for c in period if c.isalnum() or c.isspace()).strip()
-                    
-                    # Convert date to M/DD format
-                    date_obj = pd.to_datetime(date_str)
-                    formatted_date = date_obj.strftime('%-m/%d')  # %-m removes leading zero from month
-                    
-                    # Convert period to AM/PM
-                    if 'Morning' in period_clean or 'AM' in period_clean:
-                        period_short = 'AM'
-                    elif 'Afternoon' in period_clean or 'PM' in period_clean:
-                        period_short = 'PM'
-                    else:
-                        period_short = 'AM' if period_clean.lower().startswith('m') else 'PM'
-                    
-                    session_labels.append(f"{formatted_date} {period_short}")
-                else:
-                    # Single part - just use it as is but truncated
-                    session_labels.append(s_str[:8])
-            except Exception as e:
-                # Final fallback
-                session_labels.append(f"S{len(session_labels)+1}")
+        ax.set_xticks(x)
         ax.set_xticklabels(session_labels, rotation=45, fontsize=8)
         ax.grid(True, alpha=0.3)
     
     for i in range(n_players, len(axes_flat)):
         axes_flat[i].set_visible(False)
     
-    plt.suptitle('Player RPE Dashboard - All Sessions', fontsize=14, y=0.95)
-    plt.tight_layout(rect=[0, 0, 1, 0.93])
+    fig.suptitle('Player RPE Dashboard - All Sessions', fontsize=14, y=0.95)
+    fig.tight_layout(rect=[0, 0, 1, 0.93])
+    
+    return {'fig': fig, 'lines': lines, 'lock': threading.Lock()}
+
+def get_player_template(players_sorted, all_sessions):
+    """Return the cached grid for this roster and session list, building it if needed"""
+    key = (tuple(players_sorted), tuple(all_sessions))
+    with _player_templates_lock:
+        template = _player_templates.get(key)
+        if template is not None:
+            _player_templates.move_to_end(key)
+            return template
+    
+    template = build_player_template(players_sorted, all_sessions)
+    with _player_templates_lock:
+        _player_templates[key] = template
+        while len(_player_templates) > PLAYER_TEMPLATE_CACHE_SIZE:
+            _player_templates.popitem(last=False)
+    return template
+
+def player_rpe_grid(df_filtered, all_sessions):
+    """Each player's RPE per session as a players x sessions frame"""
+    players_sorted = sort_players(df_filtered['player'].unique())
+    return (df_filtered.pivot(index='player', columns='session_key', values='rpe')
+            .reindex(index=players_sorted, columns=all_sessions))
+
+def flagged_grid(rpe_grid, flagged):
+    """Boolean players x sessions mask of the (player, session_key) pairs in flagged"""
+    mask = pd.DataFrame(False, index=rpe_grid.index, columns=rpe_grid.columns)
+    for player, session in flagged:
+        if player in mask.index and session in mask.columns:
+            mask.loc[player, session] = True
+    return mask.to_numpy()
+
+def generate_player_dashboard(df_filtered, all_sessions, save=figure_to_base64, flagged=()):
+    """Generate player dashboard, ringing any flagged (player, session_key) responses"""
+    rpe_grid = player_rpe_grid(df_filtered, all_sessions)
+    alert_mask = flagged_grid(rpe_grid, flagged)
+    
+    template = get_player_template(list(rpe_grid.index), all_sessions)
+    with template['lock']:
+        for i, (player, (line, alert_line)) in enumerate(template['lines'].items()):
+            values = rpe_grid.loc[player].to_numpy(dtype=float)
+            line.set_ydata(values)
+            alert_line.set_ydata(np.where(alert_mask[i], values, np.nan))
+        
+        return save(template['fig'])
+
+def generate_player_heatmap(df_filtered, all_sessions, save=figure_to_base64, flagged=()):
+    """Generate the roster as one players x sessions heatmap, with missed sessions greyed out
+    and flagged (player, session_key) responses outlined"""
+    rpe_grid = player_rpe_grid(df_filtered, all_sessions)
+    
+    fig = Figure(figsize=player_heatmap.heatmap_figsize(len(rpe_grid)))
+    FigureCanvasAgg(fig)
+    player_heatmap.draw_player_heatmap(fig, rpe_grid, [format_session_label(s) for s in all_sessions],
+                                       alert_mask=flagged_grid(rpe_grid, flagged))
+    
+    try:
+        return save(fig)
+    finally:
+        close_figure(fig)
+
+def dashboard_charts(df_filtered, all_sessions, flagged=()):
+    """The dashboard's charts, each drawable by any backend that supports its kind"""
+    labels = [format_session_label(s) for s in all_sessions]
+    
+    def avg_values():
+        return {'labels': labels,
+                'values': average_rpe_by_session(df_filtered, all_sessions).tolist(),
+                'title': 'Average RPE per Session', 'xlabel': 'Session', 'ylabel': 'Average RPE'}
+    
+    def player_values():
+        rpe_grid = player_rpe_grid(df_filtered, all_sessions)
+        return {'titles': list(rpe_grid.index), 'labels': labels,
+                'rows': rpe_grid.to_numpy(dtype=float).tolist(),
+                'flagged': flagged_grid(rpe_grid, flagged).tolist(),
+                'title': 'Player RPE Dashboard - All Sessions'}
+    
+    Chart = chart_backends.Chart
+    return {
+        'avg': Chart('bar', lambda save: generate_avg_chart(df_filtered, all_sessions, save=save), avg_values),
+        'distribution': Chart('box', lambda save: generate_distribution_chart(df_filtered, all_sessions, save=save), None),
+        'players': Chart('line', lambda save: generate_player_dashboard(df_filtered, all_sessions, save=save, flagged=flagged),
+                         player_values),
+        'heatmap': Chart('heatmap', lambda save: generate_player_heatmap(df_filtered, all_sessions, save=save, flagged=flagged),
+                         None),
+    }
+
+# Backend per dashboard chart, picked with backend_benchmark.py (README has the numbers);
+# override with e.g. RPE_CHART_BACKENDS="avg=agg,players=agg"
+CHART_BACKENDS = {
+    'avg': 'direct-svg',
+    'distribution': 'svg',
+    'players': 'direct-svg',
+    'heatmap': 'agg',
+}
+# Chart kinds don't depend on the data, so an empty frame is enough to check overrides at startup
+DASHBOARD_CHART_KINDS = {name: chart.kind for name, chart in dashboard_charts(pd.DataFrame(), []).items()}
+CHART_BACKENDS.update(chart_backends.parse_choices(os.environ.get('RPE_CHART_BACKENDS', ''), DASHBOARD_CHART_KINDS))
+
+# Acute and chronic windows for the RPE training-load metrics on player pages
+ACUTE_WINDOW = '7D'
+CHRONIC_WINDOW = '28D'
+
+def player_history(df, player, all_sessions):
+    """One player's RPE per session, with rolling load metrics"""
+    player_data = (df[df['player'] == player]
+                   .set_index('session_key')
+                   .reindex(all_sessions))
+    
+    # Time-based rolling windows over the sessions the player actually logged
+    logged = player_data.dropna(subset=['rpe', 'sort_key']).set_index('sort_key')['rpe'].sort_index()
+    acute = logged.rolling(ACUTE_WINDOW).mean()
+    chronic = logged.rolling(CHRONIC_WINDOW).mean()
+    
+    history = pd.DataFrame({'session_key': all_sessions, 'rpe': player_data['rpe'].to_numpy(dtype=float)})
+    history['acute'] = player_data['sort_key'].map(acute).to_numpy(dtype=float)
+    history['chronic'] = player_data['sort_key'].map(chronic).to_numpy(dtype=float)
+    history['acwr'] = history['acute'] / history['chronic']
+    return history
+
+def plot_player_history(ax, history, player, metrics=False, thumbnail=False):
+    """Draw one player's RPE history, and optionally the load metrics, onto ax"""
+    x = np.arange(len(history))
+    
+    ax.plot(x, history['rpe'], 'o-', linewidth=2, markersize=4 if thumbnail else 6, label='RPE')
+    if metrics:
+        # Rolling metrics carry across missed sessions, so draw them through the gaps
+        logged = history['acwr'].notna().to_numpy()
+        ax.plot(x[logged], history['acute'][logged], '-', color='tab:orange', linewidth=1.5, label=f'Acute ({ACUTE_WINDOW} avg)')
+        ax.plot(x[logged], history['chronic'][logged], '-', color='tab:green', linewidth=1.5, label=f'Chronic ({CHRONIC_WINDOW} avg)')
+        
+        acwr_ax = ax.twinx()
+        acwr_ax.plot(x[logged], history['acwr'][logged], '--', color='tab:red', linewidth=1, label='ACWR')
+        acwr_ax.axhspan(0.8, 1.3, color='tab:green', alpha=0.08)
+        acwr_ax.set_ylim(0, 2.5)
+        acwr_ax.set_ylabel('ACWR', fontsize=8)
+        
+        handles, labels = ax.get_legend_handles_labels()
+        acwr_handles, acwr_labels = acwr_ax.get_legend_handles_labels()
+        ax.legend(handles + acwr_handles, labels + acwr_labels, fontsize=8, loc='upper left')
+    
+    ax.set_ylim(0, 10)
+    ax.grid(True, alpha=0.3)
+    ax.set_xticks(x)
+    if thumbnail:
+        ax.set_title(player, fontsize=10)
+        ax.set_xticklabels([])
+    else:
+        ax.set_title(f'{player} - RPE by Session', fontsize=12)
+        ax.set_xlabel('Session', fontsize=9)
+        ax.set_ylabel('RPE', fontsize=9)
+        ax.set_xticklabels([format_session_label(s) for s in history['session_key']],
+                           rotation=45, fontsize=8)
+
+def generate_player_chart(history, player, metrics=False, thumbnail=False):
+    """Render one player's RPE history as PNG bytes"""
+    fig = Figure(figsize=(4, 2.5) if thumbnail else (10, 5))
+    FigureCanvasAgg(fig)
+    plot_player_history(fig.subplots(), history, player, metrics=metrics, thumbnail=thumbnail)
+    fig.tight_layout()
     
     img_buffer = BytesIO()
-    plt.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight')
-    img_buffer.seek(0)
-    img_str = base64.b64encode(img_buffer.getvalue()).decode()
-    plt.close()
+    try:
+        fig.savefig(img_buffer, format='png', dpi=72 if thumbnail else 120)
+    finally:
+        close_figure(fig)
+    return img_buffer.getvalue()
+
+class ImageCache:
+    """LRU of rendered images bounded by total bytes rather than entry count"""
+    
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._images = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+            return image
+    
+    def put(self, key, image):
+        with self._lock:
+            old = self._images.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self._images[key] = image
+            self.size += len(image)
+            while self.size > self.max_bytes and len(self._images) > 1:
+                _, evicted = self._images.popitem(last=False)
+                self.size -= len(evicted)
+
+# Per-player charts, keyed by (player, data version, metrics, thumbnail)
+PLAYER_CHART_CACHE_BYTES = int(os.environ.get('PLAYER_CHART_CACHE_MB', 32)) * 1024 * 1024
+player_chart_cache = ImageCache(PLAYER_CHART_CACHE_BYTES)
+
+def session_order(df):
+    """Session keys in chronological order"""
+    return df.drop_duplicates('session_key').sort_values('sort_key')['session_key'].tolist()
+
+def current_season(df):
+    """Return (responses, season) for the season of the most recent session; older seasons live in the archive"""
+    if not len(df):
+        return df, None
+    season = archive.season_of(df['date'].max())
+    return df[archive.seasons_of(df['date']) == season], season
+
+# The most recently parsed sheet, so player pages don't re-parse the CSV per image
+_parsed_sheet = {'version': None}
+_parsed_sheet_lock = threading.Lock()
+
+def _parse_sheet_once(csv_text, version):
+    """The parsed sheet for this data version with its current season split out, parsed once per worker"""
+    with _parsed_sheet_lock:
+        if _parsed_sheet['version'] == version:
+            return dict(_parsed_sheet)
+    
+    df = parse_data(csv_text)
+    season_df, season = current_season(df)
+    parsed = {'version': version, 'df': df, 'sessions': session_order(df),
+              'season': season, 'season_df': season_df, 'season_sessions': session_order(season_df)}
+    with _parsed_sheet_lock:
+        _parsed_sheet.update(parsed)
+    return parsed
+
+def get_parsed_sheet(csv_text, version):
+    """Return (df, sessions) for this data version, parsing it only once per worker"""
+    parsed = _parse_sheet_once(csv_text, version)
+    return parsed['df'], parsed['sessions']
+
+# Earlier seasons' responses read from the archive, keyed by (data version, season)
+SEASON_CACHE_SIZE = 4
+_past_seasons = OrderedDict()
+_past_seasons_lock = threading.Lock()
+
+def get_season_responses(csv_text, version, season=None):
+    """Return (df, sessions, season) for one season: the sheet's current season by default,
+    or an earlier one from the archive. Raises KeyError for a season with no responses."""
+    parsed = _parse_sheet_once(csv_text, version)
+    if season is None or season == parsed['season']:
+        return parsed['season_df'], parsed['season_sessions'], parsed['season']
+    
+    key = (version, season)
+    with _past_seasons_lock:
+        cached = _past_seasons.get(key)
+        if cached is not None:
+            _past_seasons.move_to_end(key)
+            return cached
     
-    return img_str
+    index = archive.read_index()
+    if season in index['seasons']:
+        df = archive.load_window(*archive.season_bounds(season), index=index)
+    else:
+        # Not archived yet; fall back to whatever the sheet still holds for it
+        df = parsed['df'][archive.seasons_of(parsed['df']['date']) == season]
+    if not len(df):
+        raise KeyError(season)
+    
+    cached = (df, session_order(df), season)
+    with _past_seasons_lock:
+        _past_seasons[key] = cached
+        while len(_past_seasons) > SEASON_CACHE_SIZE:
+            _past_seasons.popitem(last=False)
+    return cached
+
+def eastern_now():
+    """Current time on the team's clock"""
+    # Eastern Daylight Time is UTC-4 (summer), Eastern Standard Time is UTC-5 (winter)
+    eastern_offset = timedelta(hours=-4)  # EDT for summer months
+    return datetime.utcnow() + eastern_offset
+
+def build_dashboard(csv_text, version):
+    """Parse the sheet and render every dashboard chart's variants for this data version"""
+    with diagnostics.stage('build:parse'):
+        df = parse_data(csv_text)
+    
+    # Keep the archive in step with the sheet; only partitions whose rows changed are rewritten
+    try:
+        with diagnostics.stage('build:archive'):
+            archive.write_partitions(df)
+    except Exception as e:
+        print(f"Could not archive responses: {e}")
+    
+    # Score only the responses submitted since the last render
+    try:
+        with diagnostics.stage('build:anomalies'):
+            raised = anomalies.ingest(df)
+        if raised:
+            print(f"Flagged {len(raised)} new RPE anomalies")
+    except Exception as e:
+        print(f"Could not score anomalies: {e}")
+    
+    # The dashboard covers the season of the most recent session
+    df, _ = current_season(df)
+    
+    # Get session data - use all sessions instead of first three
+    session_order = df.drop_duplicates('session_key').sort_values('sort_key')['session_key'].tolist()
+    all_sessions = session_order
+    df_filtered = df[df['session_key'].isin(all_sessions)]
+    alerts = anomalies.recent_alerts(since=all_sessions[0], limit=anomalies.MAX_ALERTS) if all_sessions else []
+    flagged = anomalies.flagged_sessions(alerts)
+    
+    variants = []
+    for name, chart in dashboard_charts(df_filtered, all_sessions, flagged).items():
+        with diagnostics.stage(f'build:{name}'):
+            variants += chart_backends.render(chart, name, version, backend=CHART_BACKENDS[name])
+    chart_variants.write_report(version, variants)
+    chart_variants.prune_versions()
+    
+    def picture(name):
+        return chart_variants.picture_sources([v for v in variants if v['chart'] == name],
+                                              lambda filename: f"/charts/{version}/{filename}")
+    
+    return {
+        'version': version,
+        'avg_chart': picture('avg'),
+        'dist_chart': picture('distribution'),
+        'player_chart': picture('players'),
+        'heatmap_chart': picture('heatmap'),
+        'sessions': all_sessions,
+        'alerts': [dict(alert, session_label=format_session_label(alert['session_key'])) for alert in alerts[:10]],
+        'total_players': len(df_filtered['player'].unique()),
+        'last_updated': eastern_now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+# Chart rendering runs in the background; requests show the newest finished render meanwhile
+_pipeline = ThreadPoolExecutor(max_workers=1)
+_pipeline_lock = threading.Lock()
+_pending_builds = {}
+_latest_dashboard = None
+
+def schedule_dashboard_build(csv_text, version):
+    """Queue a render of this data version unless one is already queued"""
+    with _pipeline_lock:
+        future = _pending_builds.get(version)
+        if future is not None:
+            return future
+        future = _pipeline.submit(singleflight.do, f"dashboard:{version}",
+                                  lambda: build_dashboard(csv_text, version), immutable=True)
+        _pending_builds[version] = future
+    future.add_done_callback(lambda f: _finish_dashboard_build(version, f))
+    return future
+
+def _finish_dashboard_build(version, future):
+    with _pipeline_lock:
+        _pending_builds.pop(version, None)
+    if future.exception() is None:
+        _remember_dashboard(future.result())
+    else:
+        print(f"Could not render dashboard {version}: {future.exception()}")
+
+def _remember_dashboard(charts):
+    global _latest_dashboard
+    with _pipeline_lock:
+        if _latest_dashboard is None or charts['last_updated'] >= _latest_dashboard['last_updated']:
+            _latest_dashboard = charts
+
+def get_dashboard(csv_text, version):
+    """Return rendered charts for this version, or the newest render while it is built"""
+    charts = singleflight.peek(f"dashboard:{version}")
+    if charts is not None:
+        _remember_dashboard(charts)
+        return charts
+    
+    future = schedule_dashboard_build(csv_text, version)
+    if _latest_dashboard is not None:
+        return _latest_dashboard
+    
+    # Nothing rendered yet in this worker, so the first page load has to wait
+    return future.result()
 
 @app.route('/')
 def dashboard():
     """Main dashboard page"""
     try:
         # Load fresh data
-        df, data_source = load_data()
-        
-        # Get session data - use all sessions instead of first three
-        session_order = df.drop_duplicates('session_key').sort_values('sort_key')['session_key'].tolist()
-        all_sessions = session_order
-        df_filtered = df[df['session_key'].isin(all_sessions)]
+        csv_text, version = load_sheet()
+        data_source = "Google Sheet"
         
-        # Generate charts
-        avg_chart = generate_avg_chart(df_filtered, all_sessions)
-        dist_chart = generate_distribution_chart(df_filtered, all_sessions)
-        player_chart = generate_player_dashboard(df_filtered, all_sessions)
+        # Concurrent loads of the same data version share one render
+        charts = get_dashboard(csv_text, version)
         
-        # Get stats
-        total_players = len(df_filtered['player'].unique())
-        # Eastern Daylight Time is UTC-4 (summer), Eastern Standard Time is UTC-5 (winter)
-        eastern_offset = timedelta(hours=-4)  # EDT for summer months
-        utc_now = datetime.utcnow()
-        eastern_time = utc_now + eastern_offset
-        last_updated = eastern_time.strftime("%Y-%m-%d %H:%M:%S")
+        # Both roster views are rendered with every version; the query string picks one
+        player_view = 'heatmap' if request.args.get('players') == 'heatmap' else 'grid'
         
-        return render_template('dashboard.html',
-                             avg_chart=avg_chart,
-                             dist_chart=dist_chart,
-                             player_chart=player_chart,
-                             sessions=all_sessions,
-                             sessions_json=str(all_sessions),
-                             total_players=total_players,
-                             data_source=data_source,
-                             last_updated=last_updated)
+        # The page is identical for every request of a render, so unchanged data costs a 304
+        etag = hashlib.sha1(f"dashboard:{charts['version']}:{charts['last_updated']}:{player_view}".encode()).hexdigest()
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = make_response(render_template('dashboard.html',
+                                                  avg_chart=charts['avg_chart'],
+                                                  dist_chart=charts['dist_chart'],
+                                                  player_chart=charts['heatmap_chart' if player_view == 'heatmap' else 'player_chart'],
+                                                  player_view=player_view,
+                                                  sessions=charts['sessions'],
+                                                  alerts=charts.get('alerts', []),
+                                                  sessions_json=str(charts['sessions']),
+                                                  total_players=charts['total_players'],
+                                                  data_source=data_source,
+                                                  last_updated=charts['last_updated']))
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
     
     except Exception as e:
         return f"Error generating dashboard: {str(e)}", 500
 
+@app.route('/charts/<version>/<filename>')
+def chart_file(version, filename):
+    """Serve a rendered chart variant; URLs name their data version, so they never change"""
+    if not re.fullmatch(r'[0-9a-f]{40}', version):
+        abort(404)
+    response = send_from_directory(chart_variants.CHART_DIR / version, filename, max_age=365 * 24 * 3600)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    if response.mimetype == 'image/svg+xml':
+        # Let the compression hook see SVG bodies; rasters are already compressed.
+        # Reading the file into the response keeps it from counting as a streamed body
+        response.direct_passthrough = False
+        response.make_sequence()
+    return response
+
+@app.route('/api/chart-variants')
+def chart_variant_report():
+    """Bytes and render cost of every chart variant for the data version being served"""
+    if _latest_dashboard is None:
+        return jsonify({'status': 'error', 'message': 'No dashboard has been rendered yet'}), 404
+    
+    version = _latest_dashboard['version']
+    variants = chart_variants.read_report(version)
+    if variants is None:
+        return jsonify({'status': 'error', 'message': f'No variant report for {version}'}), 404
+    
+    return jsonify({
+        'status': 'success',
+        'version': version,
+        'variants': variants,
+        'kept_bytes': sum(v['bytes'] for v in variants if v['kept']),
+        'render_ms': sum(v['render_ms'] for v in variants)
+    })
+
+def requested_season():
+    """?season=2024-25 picks an archived season; player views default to the current one"""
+    return request.args.get('season') or None
+
+@app.route('/players')
+def roster():
+    """Roster page with a lazily loaded thumbnail per player"""
+    try:
+        csv_text, version = load_sheet()
+        df, _, season = get_season_responses(csv_text, version, requested_season())
+    except KeyError:
+        abort(404)
+    except Exception as e:
+        return f"Error loading roster: {str(e)}", 500
+    
+    return render_template('roster.html',
+                           players=sort_players(df['player'].unique()),
+                           version=version,
+                           season=season,
+                           season_param=requested_season())
+
+@app.route('/player/<name>')
+def player_page(name):
+    """Drill-down page for one player"""
+    try:
+        csv_text, version = load_sheet()
+        df, all_sessions, season = get_season_responses(csv_text, version, requested_season())
+    except KeyError:
+        abort(404)
+    except Exception as e:
+        return f"Error loading player: {str(e)}", 500
+    
+    if name not in set(df['player']):
+        abort(404)
+    
+    history = player_history(df, name, all_sessions)
+    logged = history['rpe'].dropna()
+    acwr = history['acwr'].dropna()
+    return render_template('player.html',
+                           player=name,
+                           version=version,
+                           season=season,
+                           season_param=requested_season(),
+                           sessions_logged=len(logged),
+                           total_sessions=len(all_sessions),
+                           average_rpe=round(float(logged.mean()), 1) if len(logged) else None,
+                           latest_acwr=round(float(acwr.iloc[-1]), 2) if len(acwr) else None)
+
+@app.route('/charts/player/<name>.png')
+def player_chart(name):
+    """One player's RPE chart; ?metrics=1 adds training load, ?size=thumb renders a thumbnail,
+    ?season=2024-25 charts an archived season"""
+    metrics = request.args.get('metrics') == '1'
+    thumbnail = request.args.get('size') == 'thumb'
+    season = requested_season()
+    requested_version = request.args.get('v')
+    
+    # Pages pin their images to a data version, so a cached render can skip the sheet fetch
+    image = None
+    if requested_version:
+        image = player_chart_cache.get((name, requested_version, season, metrics, thumbnail))
+    version = requested_version
+    
+    if image is None:
+        try:
+            csv_text, version = load_sheet()
+            df, all_sessions, _ = get_season_responses(csv_text, version, season)
+        except KeyError:
+            abort(404)
+        except Exception as e:
+            return f"Error loading player chart: {str(e)}", 500
+        if name not in set(df['player']):
+            abort(404)
+        
+        key = (name, version, season, metrics, thumbnail)
+        image = player_chart_cache.get(key)
+        if image is None:
+            image = generate_player_chart(player_history(df, name, all_sessions), name,
+                                          metrics=metrics, thumbnail=thumbnail)
+            player_chart_cache.put(key, image)
+    
+    response = Response(image, mimetype='image/png')
+    if requested_version and requested_version == version:
+        response.cache_control.public = True
+        response.cache_control.max_age = 365 * 24 * 3600
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    return response
+
+@app.route('/api/data-quality')
+def data_quality():
+    """Rows the ingestion stage rejected from the current sheet, and why"""
+    try:
+        csv_text, version = load_sheet()
+        df, rejected = ingest.parse_responses(csv_text)
+        return jsonify({
+            'status': 'success',
+            'version': version,
+            'accepted_rows': len(df),
+            'rejected_rows': len(rejected),
+            'rejected_by_reason': ingest.rejection_summary(rejected),
+            'rejected': rejected.head(100).astype(str).to_dict(orient='records')
+        })
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+@app.route('/export/responses.<fmt>')
+def export_responses(fmt):
+    """Download the normalized responses as CSV or Parquet, streamed a chunk at a time"""
+    if fmt not in ('csv', 'parquet'):
+        abort(404)
+    if fmt == 'parquet' and not export.parquet_available():
+        return jsonify({'status': 'error', 'message': 'Parquet export needs pyarrow installed'}), 501
+    
+    try:
+        csv_text, version = load_sheet()
+        df, _ = get_parsed_sheet(csv_text, version)
+    except Exception as e:
+        return f"Error exporting responses: {str(e)}", 500
+    
+    if fmt == 'csv':
+        response = Response(export.csv_chunks(df), mimetype='text/csv')
+    else:
+        response = Response(export.parquet_chunks(df), mimetype='application/vnd.apache.parquet')
+    response.headers['Content-Disposition'] = f'attachment; filename=rpe-responses-{version[:8]}.{fmt}'
+    return response
+
+@app.route('/api/alerts')
+def alerts():
+    """Flagged RPE responses, newest first; filter with ?player=, ?since=YYYY-MM-DD and ?limit="""
+    try:
+        limit = int(request.args.get('limit', 100))
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'limit must be an integer'}), 400
+    
+    state = anomalies.read_state()
+    return jsonify({
+        'status': 'success',
+        'watermark': state['watermark'],
+        'thresholds': {'z': anomalies.Z_THRESHOLD, 'acwr': anomalies.ACWR_THRESHOLD},
+        'alerts': anomalies.recent_alerts(player=request.args.get('player'),
+                                          since=request.args.get('since'),
+                                          limit=limit, state=state)
+    })
+
+@app.route('/api/diagnostics/memory')
+def memory_diagnostics():
+    """This worker's RSS, per-stage memory, live figures and caches.
+    
+    ?trace=start begins tracemalloc, later calls show allocation growth since then,
+    and ?trace=stop ends it; ?gc=1 runs a full collection first.
+    """
+    trace = request.args.get('trace')
+    if trace == 'start':
+        diagnostics.start_tracing()
+    elif trace == 'stop':
+        diagnostics.stop_tracing()
+    elif trace is not None:
+        return jsonify({'status': 'error', 'message': 'trace must be start or stop'}), 400
+    
+    collected = gc.collect() if request.args.get('gc') == '1' else None
+    result = diagnostics.report()
+    result.update({
+        'status': 'success',
+        'gc_collected': collected,
+        'player_templates': len(_player_templates),
+        'player_chart_cache_mb': round(player_chart_cache.size / 2 ** 20, 2),
+        'past_seasons': len(_past_seasons),
+        'pending_builds': len(_pending_builds),
+    })
+    return jsonify(result)
+
+@app.route('/api/seasons')
+def seasons():
+    """Archived seasons and partitions; ?season=2025-26 adds that season's aggregates"""
+    index = archive.read_index()
+    result = {
+        'status': 'success',
+        # Aggregates are bulky, so list seasons without them unless one is asked for
+        'seasons': {name: {k: v for k, v in info.items() if k != 'aggregates'}
+                    for name, info in index['seasons'].items()},
+        'partitions': index['partitions']
+    }
+    
+    season = request.args.get('season')
+    if season:
+        if season not in index['seasons']:
+            return jsonify({'status': 'error', 'message': f'Unknown season {season}'}), 404
+        result['aggregates'] = archive.season_aggregates(season, index=index)
+    return jsonify(result)
+
 @app.route('/api/refresh')
 def refresh_data():
     """API endpoint to check if new data is available"""
@@ -339,10 +863,7 @@ def refresh_data():
         session_count = len(df['session_key'].dropna().unique())
         player_count = len(df['player'].unique())
         
-        # Eastern Daylight Time is UTC-4 (summer), Eastern Standard Time is UTC-5 (winter)
-        eastern_offset = timedelta(hours=-4)  # EDT for summer months
-        utc_now = datetime.utcnow()
-        eastern_time = utc_now + eastern_offset
+        eastern_time = eastern_now()
         
         return jsonify({
             'status': 'success',
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+RPE Response Archive
+Keeps normalized responses in per-month columnar partitions grouped by
+season, with a small index of date ranges, row counts and fingerprints.
+Queries memory-map only the partitions covering the requested window, and
+closed seasons are written once with their aggregates precomputed.
+
+    python archive.py sync      # archive the current sheet
+    python archive.py show      # list seasons and partitions
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import sys
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ARCHIVE_DIR = Path(os.environ.get('RPE_ARCHIVE_DIR', Path(__file__).parent / 'archive'))
+INDEX_FILE = 'index.json'
+
+# Columns stored per partition; strings are kept as fixed-width unicode so they can be memory-mapped
+COLUMNS = {
+    'timestamp': 'datetime64[ns]',
+    'date': 'datetime64[ns]',
+    'sort_key': 'datetime64[ns]',
+    'session_period': 'U',
+    'player': 'U',
+    'session_key': 'U',
+    'rpe': 'float64',
+}
+
+# Seasons run July through June, so a fall season and its spring training share one label
+SEASON_START_MONTH = 7
+
+
+def season_of(day):
+    """Season label for a date, e.g. 2025-08-05 -> '2025-26'"""
+    start_year = day.year if day.month >= SEASON_START_MONTH else day.year - 1
+    return f"{start_year}-{(start_year + 1) % 100:02d}"
+
+
+def seasons_of(dates):
+    """Vectorized season_of for a datetime Series"""
+    start_year = dates.dt.year - (dates.dt.month < SEASON_START_MONTH).astype(int)
+    return start_year.astype(str) + '-' + ((start_year + 1) % 100).astype(str).str.zfill(2)
+
+
+def season_bounds(season):
+    """First and last day of a season label"""
+    start_year = int(season.split('-')[0])
+    start = pd.Timestamp(start_year, SEASON_START_MONTH, 1)
+    return start, start + pd.DateOffset(years=1) - pd.Timedelta(days=1)
+
+
+def season_closed(season, today=None):
+    """A season is closed (and immutable) once its last day has passed"""
+    today = pd.Timestamp(today or date.today())
+    return season_bounds(season)[1] < today
+
+
+def fingerprint(df):
+    """Content hash of a partition's rows, independent of row order"""
+    hashes = np.sort(pd.util.hash_pandas_object(df[list(COLUMNS)], index=False).to_numpy())
+    return hashlib.sha1(hashes.tobytes()).hexdigest()
+
+
+def read_index():
+    try:
+        with open(ARCHIVE_DIR / INDEX_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'partitions': {}, 'seasons': {}}
+
+
+def _write_index(index):
+    tmp_path = ARCHIVE_DIR / f"{INDEX_FILE}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, ARCHIVE_DIR / INDEX_FILE)
+
+
+def _write_partition(name, part):
+    """Write one partition's columns as .npy files, replacing any previous copy"""
+    final_dir = ARCHIVE_DIR / name
+    tmp_dir = final_dir.with_name(f"{final_dir.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+
+    for column, dtype in COLUMNS.items():
+        values = part[column].to_numpy()
+        if dtype == 'U':
+            values = values.astype(str)
+        else:
+            values = values.astype(dtype)
+        np.save(tmp_dir / f"{column}.npy", values, allow_pickle=False)
+
+    if final_dir.exists():
+        old_dir = final_dir.with_name(f"{final_dir.name}.{os.getpid()}.old")
+        os.replace(final_dir, old_dir)
+        os.replace(tmp_dir, final_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+    else:
+        os.replace(tmp_dir, final_dir)
+
+
+def write_partitions(df, today=None):
+    """Archive normalized responses, rewriting only partitions whose rows changed.
+
+    Partitions of closed seasons that are already archived are never
+    rewritten, and each closed season's aggregates are computed once.
+    Returns the names of the partitions written.
+    """
+    if df.empty:
+        return []
+
+    ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+    seasons = seasons_of(df['date'])
+    months = df['date'].dt.strftime('%Y-%m')
+
+    written = []
+    with open(ARCHIVE_DIR / '.lock', 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            index = read_index()
+            for (season, month), part in df.groupby([seasons, months], sort=True):
+                name = f"{season}/{month}"
+                entry = index['partitions'].get(name)
+                closed = season_closed(season, today)
+                if entry is not None and closed:
+                    continue
+
+                part_fingerprint = fingerprint(part)
+                if entry is not None and entry['fingerprint'] == part_fingerprint:
+                    continue
+
+                _write_partition(name, part)
+                index['partitions'][name] = {
+                    'season': season,
+                    'start': part['date'].min().strftime('%Y-%m-%d'),
+                    'end': part['date'].max().strftime('%Y-%m-%d'),
+                    'rows': len(part),
+                    'fingerprint': part_fingerprint,
+                }
+                written.append(name)
+
+            for season in sorted(set(seasons)):
+                closed = season_closed(season, today)
+                info = index['seasons'].setdefault(season, {})
+                if closed and 'aggregates' not in info:
+                    info['aggregates'] = compute_aggregates(load_window(*season_bounds(season), index=index))
+                info['closed'] = closed
+
+            _write_index(index)
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    return written
+
+
+def partitions_for(start=None, end=None, index=None):
+    """Names of the partitions whose date range overlaps [start, end]"""
+    index = index or read_index()
+    start = pd.Timestamp(start) if start is not None else None
+    end = pd.Timestamp(end) if end is not None else None
+    names = []
+    for name, entry in sorted(index['partitions'].items()):
+        if end is not None and pd.Timestamp(entry['start']) > end:
+            continue
+        if start is not None and pd.Timestamp(entry['end']) < start:
+            continue
+        names.append(name)
+    return names
+
+
+def load_window(start=None, end=None, columns=None, index=None):
+    """Load archived responses dated within [start, end], touching only overlapping partitions"""
+    columns = list(columns or COLUMNS)
+    frames = []
+    for name in partitions_for(start, end, index=index):
+        part_dir = ARCHIVE_DIR / name
+        dates = np.load(part_dir / 'date.npy', mmap_mode='r')
+        mask = np.ones(len(dates), dtype=bool)
+        if start is not None:
+            mask &= dates >= np.datetime64(pd.Timestamp(start))
+        if end is not None:
+            mask &= dates <= np.datetime64(pd.Timestamp(end))
+        if not mask.any():
+            continue
+        # Only the rows inside the window are copied out of each mapped column
+        frames.append(pd.DataFrame({
+            column: np.load(part_dir / f"{column}.npy", mmap_mode='r')[mask]
+            for column in columns
+        }))
+
+    if not frames:
+        return pd.DataFrame({column: pd.Series(dtype=COLUMNS[column] if COLUMNS[column] != 'U' else object)
+                             for column in columns})
+    df = pd.concat(frames, ignore_index=True)
+    for column in columns:
+        if COLUMNS[column] == 'U':
+            df[column] = df[column].astype(object)
+    return df.sort_values('sort_key', kind='stable').reset_index(drop=True) if 'sort_key' in df else df
+
+
+def compute_aggregates(df):
+    """Season summary: per-session and per-player RPE statistics"""
+    sessions = df.groupby('session_key')['rpe'].agg(['mean', 'count']).round(2)
+    players = df.groupby('player')['rpe'].agg(['mean', 'count']).round(2)
+    return {
+        'rows': len(df),
+        'sessions': len(sessions),
+        'players': len(players),
+        'mean_rpe': round(float(df['rpe'].mean()), 2) if len(df) else None,
+        'by_session': sessions.to_dict(orient='index'),
+        'by_player': players.to_dict(orient='index'),
+    }
+
+
+def season_aggregates(season, index=None):
+    """Precomputed aggregates for a closed season, or computed now for an open one"""
+    index = index or read_index()
+    info = index['seasons'].get(season, {})
+    if 'aggregates' in info:
+        return info['aggregates']
+    return compute_aggregates(load_window(*season_bounds(season), index=index))
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else 'show'
+    if command == 'sync':
+        from app import load_data
+        df, data_source = load_data()
+        written = write_partitions(df)
+        print(f"✅ Archived {len(df)} rows from {data_source}; rewrote {len(written)} partitions: {written}")
+    elif command == 'show':
+        index = read_index()
+        for season, info in sorted(index['seasons'].items()):
+            status = 'closed' if info.get('closed') else 'open'
+            print(f"📅 {season} ({status})")
+            for name, entry in sorted(index['partitions'].items()):
+                if entry['season'] == season:
+                    print(f"   {name}: {entry['rows']} rows, {entry['start']} to {entry['end']}")
+    else:
+        print(f"Unknown command: {command} (use 'sync' or 'show')")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Chart Backend Benchmark
+Renders every dashboard chart with every backend that can draw it, against a
+synthetic sheet, and reports render time and the bytes a browser downloads.
+The suggested default per chart is the one with the lowest render time plus
+transfer time at --mbps.
+
+    python backend_benchmark.py --players 28 --days 60 --repeats 3
+"""
+
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import app
+import chart_backends
+import chart_variants
+import mock_sheet_server
+
+
+def downloaded_bytes(variants, width=None):
+    """Bytes a browser fetches for this chart at a viewport width (None = largest)"""
+    kept = [v for v in variants if v['kept']]
+    svg = [v for v in kept if v['format'] == 'svg']
+    if svg:
+        return svg[0]['bytes']
+    widths = sorted({v['width'] for v in kept})
+    chosen = widths[-1] if width is None else next((w for w in widths if w >= width), widths[-1])
+    return min(v['bytes'] for v in kept if v['width'] == chosen)
+
+
+def benchmark(chart, name, backend, repeats):
+    timings = []
+    for attempt in range(repeats):
+        started = time.perf_counter()
+        variants = chart_backends.render(chart, name, f"bench-{backend}-{attempt}", backend=backend)
+        timings.append((time.perf_counter() - started) * 1000)
+    return {
+        'chart': name,
+        'backend': backend,
+        'render_ms': statistics.median(timings),
+        'first_ms': timings[0],
+        'desktop_bytes': downloaded_bytes(variants),
+        'mobile_bytes': downloaded_bytes(variants, width=480),
+        'files': sum(1 for v in variants if v['kept']),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark chart rendering backends')
+    parser.add_argument('--players', type=int, default=28)
+    parser.add_argument('--days', type=int, default=20, help='practice days (two sessions each)')
+    parser.add_argument('--repeats', type=int, default=3, help='renders per chart and backend (median reported)')
+    parser.add_argument('--mbps', type=float, default=5, help='download speed used to weigh bytes against render time')
+    args = parser.parse_args()
+
+    sheet = mock_sheet_server.SyntheticSheet(players=args.players, days=args.days)
+    df = app.parse_data(sheet.body.decode('utf-8'))
+    sessions = df.drop_duplicates('session_key').sort_values('sort_key')['session_key'].tolist()
+    charts = app.dashboard_charts(df, sessions)
+
+    # Benchmark renders go to a scratch directory, not the live chart cache
+    chart_variants.CHART_DIR = Path(tempfile.mkdtemp(prefix='rpe_backend_benchmark_'))
+    print(f"🏁 Chart backends: {len(df)} responses, {args.players} players, {len(sessions)} sessions, "
+          f"median of {args.repeats}")
+    print(f"{'chart':<14}{'backend':<12}{'render ms':>10}{'first ms':>10}{'desktop KB':>12}{'mobile KB':>11}{'files':>7}")
+
+    try:
+        choices = {}
+        for name, chart in charts.items():
+            results = [benchmark(chart, name, backend, args.repeats)
+                       for backend in chart_backends.backends_for(chart.kind)]
+            for r in results:
+                print(f"{name:<14}{r['backend']:<12}{r['render_ms']:>10.0f}{r['first_ms']:>10.0f}"
+                      f"{r['desktop_bytes'] / 1024:>12.1f}{r['mobile_bytes'] / 1024:>11.1f}{r['files']:>7}")
+
+            def cost_ms(r):
+                return r['render_ms'] + r['desktop_bytes'] * 8 / (args.mbps * 1000)
+            choices[name] = min(results, key=cost_ms)['backend']
+    finally:
+        shutil.rmtree(chart_variants.CHART_DIR, ignore_errors=True)
+
+    print(f"\n✅ Suggested CHART_BACKENDS at {args.mbps:g} Mbps: {choices}")
+    if choices != app.CHART_BACKENDS:
+        print(f"   (currently {app.CHART_BACKENDS}; set RPE_CHART_BACKENDS to try it: "
+              f"{','.join(f'{k}={v}' for k, v in choices.items())})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Chart rendering backends
+Dashboard charts describe themselves as a Chart: a kind, a function that
+draws them with matplotlib, and the plain values behind them. A backend turns
+a Chart into variant files:
+
+    agg         matplotlib Agg rasters: PNG and WebP at every srcset width
+    svg         matplotlib's SVG output, for the simple bar and box charts
+    direct-svg  SVG markup written straight from the values (svg_charts.py)
+
+backend_benchmark.py measures each backend per chart to pick the defaults.
+"""
+
+import time
+from collections import namedtuple
+
+import chart_variants
+import svg_charts
+
+# kind: 'bar', 'box', 'line' or 'heatmap'
+# draw(save): builds the matplotlib figure and returns save(fig)
+# data(): keyword arguments for the direct writer of this kind, or None if it has none
+Chart = namedtuple('Chart', ['kind', 'draw', 'data'])
+
+
+class AggBackend:
+    """Rasterize with matplotlib's Agg and write every width and format"""
+    name = 'agg'
+    kinds = ('bar', 'box', 'line', 'heatmap')
+
+    def render(self, chart, name, version):
+        return chart.draw(lambda fig: chart_variants.render_chart_variants(fig, name, version))
+
+
+class MatplotlibSVGBackend:
+    """matplotlib's SVG output; small for charts with few artists"""
+    name = 'svg'
+    kinds = ('bar', 'box')
+
+    def render(self, chart, name, version):
+        return chart.draw(lambda fig: [chart_variants.render_figure_svg(fig, name, version)])
+
+
+class DirectSVGBackend:
+    """Write SVG from the chart's values, skipping matplotlib entirely"""
+    name = 'direct-svg'
+    kinds = ('bar', 'line')
+    writers = {'bar': svg_charts.bar_chart, 'line': svg_charts.line_grid}
+
+    def render(self, chart, name, version):
+        started = time.perf_counter()
+        svg, width, height = self.writers[chart.kind](**chart.data())
+        render_ms = (time.perf_counter() - started) * 1000
+        return [chart_variants.write_svg_variant(svg.encode('utf-8'), name, version, width, height, render_ms)]
+
+
+BACKENDS = {backend.name: backend for backend in (AggBackend(), MatplotlibSVGBackend(), DirectSVGBackend())}
+
+
+def backends_for(kind):
+    """Names of the backends that can draw this kind of chart"""
+    return [name for name, backend in BACKENDS.items() if kind in backend.kinds]
+
+
+def render(chart, name, version, backend='agg'):
+    """Render a chart's variants with the named backend"""
+    if chart.kind not in BACKENDS[backend].kinds:
+        raise ValueError(f"The {backend} backend can't draw {chart.kind} charts")
+    return BACKENDS[backend].render(chart, name, version)
+
+
+def parse_choices(spec, kinds):
+    """Parse per-chart overrides like 'avg=agg,players=direct-svg'.
+
+    kinds maps each chart name to its kind; an unknown chart, or a backend
+    that can't draw that chart's kind, raises ValueError.
+    """
+    choices = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        name, _, backend = (part.strip() for part in item.partition('='))
+        if name not in kinds:
+            raise ValueError(f"Unknown chart {name!r}; use one of {', '.join(kinds)}")
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown chart backend {backend!r} for {name}; use one of {', '.join(BACKENDS)}")
+        if kinds[name] not in BACKENDS[backend].kinds:
+            raise ValueError(f"The {backend} backend can't draw the {name} chart ({kinds[name]}); "
+                             f"use one of {', '.join(backends_for(kinds[name]))}")
+        choices[name] = backend
+    return choices
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Responsive chart variants for the RPE dashboard
+Each chart is rendered once per data version and written out at a few
+widths and formats, so phones can fetch a small image through srcset
+instead of the full desktop-sized PNG.
+"""
+
+import json
+import shutil
+import time
+from io import BytesIO
+
+from PIL import Image
+
+import compression
+import singleflight
+
+# One directory of variant files per data version
+CHART_DIR = singleflight.CACHE_DIR / 'charts'
+
+# Versions kept on disk; pages rendered from older versions lose their images
+CHART_VERSIONS_KEPT = 5
+
+# Raster widths offered to browsers, plus each chart's native width
+VARIANT_WIDTHS = (480, 960, 1600)
+
+# Native resolution, matching what the dashboard has always served
+RENDER_DPI = 150
+
+MIME_TYPES = {
+    'png': 'image/png',
+    'webp': 'image/webp',
+    'svg': 'image/svg+xml',
+}
+
+
+def render_chart_variants(fig, name, version):
+    """Write every raster variant of fig for this data version and describe them.
+
+    The figure is rasterized once at RENDER_DPI; smaller widths (palette
+    quantized) and WebP copies are produced from that raster. WebP is kept
+    only where it beats the PNG of the same width; dropped variants still
+    appear in the returned report so their cost can be reviewed.
+    """
+    out_dir = CHART_DIR / version
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    # The chart generators already lay figures out, so skip savefig's extra tight-bbox pass
+    started = time.perf_counter()
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png', dpi=RENDER_DPI)
+    base_ms = (time.perf_counter() - started) * 1000
+
+    base = Image.open(BytesIO(buffer.getvalue()))
+    base.load()
+    widths = [w for w in VARIANT_WIDTHS if w < base.width] + [base.width]
+
+    variants = []
+    for width in widths:
+        started = time.perf_counter()
+        if width == base.width:
+            image = base
+        else:
+            # Resampling adds thousands of blended colours; charts are flat, so fold them back
+            # into a palette or the small PNGs end up bigger than the full-size render
+            image = base.resize((width, round(base.height * width / base.width)), Image.LANCZOS)
+            image = image.convert('RGB').quantize(256, method=Image.Quantize.FASTOCTREE)
+        resize_ms = (time.perf_counter() - started) * 1000
+
+        png = _encode(image, 'png')
+        webp = _encode(image, 'webp')
+        png['render_ms'] += resize_ms + (base_ms if width == base.width else 0)
+        webp['render_ms'] += resize_ms
+        webp['kept'] = webp['bytes'] < png['bytes']
+
+        for variant, data in ((png, png.pop('data')), (webp, webp.pop('data'))):
+            variant.update({'chart': name, 'width': image.width, 'height': image.height})
+            variant['file'] = f"{name}-{image.width}.{variant['format']}"
+            if variant['kept']:
+                (out_dir / variant['file']).write_bytes(data)
+            variants.append(variant)
+
+    return variants
+
+
+def render_figure_svg(fig, name, version):
+    """Write fig as a single SVG variant, sized like its raster at RENDER_DPI"""
+    started = time.perf_counter()
+    buffer = BytesIO()
+    fig.savefig(buffer, format='svg')
+    width, height = (round(v) for v in fig.get_size_inches() * RENDER_DPI)
+    return write_svg_variant(buffer.getvalue(), name, version, width, height,
+                             (time.perf_counter() - started) * 1000)
+
+
+def write_svg_variant(data, name, version, width, height, render_ms):
+    """Write SVG markup as a chart's variant; one file serves every width"""
+    out_dir = CHART_DIR / version
+    out_dir.mkdir(parents=True, exist_ok=True)
+    variant = {
+        'chart': name,
+        'format': 'svg',
+        'width': width,
+        'height': height,
+        # SVG goes out through the compression hook, so count what actually crosses the wire
+        'bytes': len(compression.compress(data, 'gzip')),
+        'raw_bytes': len(data),
+        'render_ms': render_ms,
+        'kept': True,
+        'file': f"{name}.svg",
+    }
+    (out_dir / variant['file']).write_bytes(data)
+    return variant
+
+
+def _encode(image, fmt):
+    """Encode a raster variant, timing the encode"""
+    started = time.perf_counter()
+    buffer = BytesIO()
+    if fmt == 'webp':
+        image.save(buffer, format='WEBP', lossless=True, method=4)
+    else:
+        image.save(buffer, format='PNG')
+    data = buffer.getvalue()
+    return {
+        'format': fmt,
+        'bytes': len(data),
+        'render_ms': (time.perf_counter() - started) * 1000,
+        'kept': True,
+        'data': data,
+    }
+
+
+def picture_sources(variants, url_for_file):
+    """Group kept variants into <picture> sources, smallest formats first"""
+    svgs = [v for v in variants if v['format'] == 'svg' and v['kept']]
+    pngs = [v for v in variants if v['format'] == 'png']
+    if not pngs:
+        # A vector-only chart: one file at every width, no srcset needed
+        return {'sources': [], 'srcset': '', 'src': url_for_file(svgs[0]['file']),
+                'width': svgs[0]['width'], 'height': svgs[0]['height']}
+
+    sources = []
+    for fmt in ('svg', 'webp'):
+        kept = [v for v in variants if v['format'] == fmt and v['kept']]
+        if kept:
+            srcset = ', '.join(f"{url_for_file(v['file'])} {v['width']}w" for v in kept)
+            sources.append({'type': MIME_TYPES[fmt], 'srcset': srcset})
+
+    largest = pngs[-1]
+    return {
+        'sources': sources,
+        'srcset': ', '.join(f"{url_for_file(v['file'])} {v['width']}w" for v in pngs),
+        'src': url_for_file(largest['file']),
+        'width': largest['width'],
+        'height': largest['height'],
+    }
+
+
+def write_report(version, variants):
+    """Store the per-variant bytes and render cost next to the files"""
+    with open(CHART_DIR / version / 'variants.json', 'w') as f:
+        json.dump(variants, f, indent=2)
+
+
+def read_report(version):
+    """Load the variant report for a data version, or None if it isn't rendered"""
+    try:
+        with open(CHART_DIR / version / 'variants.json', 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def prune_versions():
+    """Remove variant directories beyond the most recent CHART_VERSIONS_KEPT"""
+    if not CHART_DIR.exists():
+        return
+    versions = sorted((p for p in CHART_DIR.iterdir() if p.is_dir()),
+                      key=lambda p: p.stat().st_mtime, reverse=True)
+    for path in versions[CHART_VERSIONS_KEPT:]:
+        shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Response compression for the RPE dashboard
+Compresses each distinct response body once and serves the cached gzip or
+brotli bytes to every client that accepts them.
+"""
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip covers every browser
+    brotli = None
+
+# Bodies smaller than this are not worth compressing
+MIN_SIZE = 1024
+
+# Compressed bodies kept per encoding; a few data versions of every view
+CACHE_SIZE = 32
+
+COMPRESSIBLE_MIMETYPES = {
+    'text/html',
+    'text/css',
+    'text/csv',
+    'text/plain',
+    'application/json',
+    'application/javascript',
+    'image/svg+xml',
+}
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def available_encodings():
+    """Content codings we can produce, most preferred first"""
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+def compress(body, encoding):
+    """Compress body with the given content coding"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=6)
+    return gzip.compress(body, compresslevel=9, mtime=0)
+
+
+def cached_compress(key, body, encoding):
+    """Compress body once per (key, encoding) and reuse the bytes afterwards"""
+    cache_key = (key, encoding)
+    with _cache_lock:
+        compressed = _cache.get(cache_key)
+        if compressed is not None:
+            _cache.move_to_end(cache_key)
+            return compressed
+
+    compressed = compress(body, encoding)
+    with _cache_lock:
+        _cache[cache_key] = compressed
+        while len(_cache) > CACHE_SIZE * len(available_encodings()):
+            _cache.popitem(last=False)
+    return compressed
+
+
+def compress_response(response):
+    """after_request hook: negotiate Accept-Encoding and compress the body"""
+    if (response.status_code != 200
+            or response.direct_passthrough
+            or response.is_streamed
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or 'Content-Encoding' in response.headers):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = request.accept_encodings.best_match(available_encodings())
+    if encoding is None:
+        return response
+
+    body = response.get_data()
+    if len(body) < MIN_SIZE:
+        return response
+
+    # Versioned views set an ETag, so the same body is never hashed twice
+    etag, _ = response.get_etag()
+    key = etag or hashlib.sha1(body).hexdigest()
+
+    response.set_data(cached_compress(key, body, encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def init_app(app):
+    """Compress every eligible response the app sends"""
+    app.after_request(compress_response)
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Worker Memory Diagnostics
+Records time, RSS growth and peak RSS per request and per render stage,
+counts live matplotlib figures, and takes tracemalloc snapshots on demand,
+so memory creep in a long-running worker can be pinned to a stage.
+
+Peak RSS is reset at the start of each stage (Linux only); when stages
+overlap on different threads the peaks are approximate.
+"""
+
+import ctypes
+import ctypes.util
+import gc
+import os
+import resource
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import matplotlib.pyplot as plt
+from flask import g, request
+from matplotlib.figure import Figure
+
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+TRACE_FRAMES = 10
+TOP_ALLOCATIONS = 20
+
+_stages = {}
+_stages_lock = threading.Lock()
+_requests_served = 0
+_trace_baseline = None
+
+
+def rss_mb():
+    """Current resident set size of this process"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * PAGE_SIZE / 2 ** 20
+    except OSError:
+        return lifetime_peak_rss_mb()
+
+
+def lifetime_peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def peak_rss_mb():
+    """Peak RSS since the last reset_peak(), or since the process started"""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return lifetime_peak_rss_mb()
+
+
+def reset_peak():
+    """Reset the kernel's RSS high-water mark to the current RSS"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def release_free_memory():
+    """Hand freed heap pages back to the OS (glibc only), so RSS reflects memory still in use.
+
+    Large render buffers leave the heap fragmented after they are freed, which
+    shows up as RSS steps that are not leaks. Returns False where unsupported.
+    """
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'))
+        return bool(libc.malloc_trim(0))
+    except (OSError, AttributeError):
+        return False
+
+
+def record(name, seconds, rss_growth, peak):
+    with _stages_lock:
+        stats = _stages.setdefault(name, {'count': 0, 'seconds': 0.0, 'rss_growth_mb': 0.0,
+                                          'last_peak_mb': 0.0, 'max_peak_mb': 0.0})
+        stats['count'] += 1
+        stats['seconds'] += seconds
+        stats['rss_growth_mb'] += rss_growth
+        stats['last_peak_mb'] = peak
+        stats['max_peak_mb'] = max(stats['max_peak_mb'], peak)
+
+
+@contextmanager
+def stage(name):
+    """Record the time, RSS growth and peak RSS of the enclosed block under name"""
+    reset_peak()
+    start_rss = rss_mb()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started, rss_mb() - start_rss, peak_rss_mb())
+
+
+def figure_counts():
+    """Figures pyplot still manages, and every Figure object alive (a full heap scan)"""
+    return {
+        'pyplot': len(plt.get_fignums()),
+        'alive': sum(1 for obj in gc.get_objects() if isinstance(obj, Figure)),
+    }
+
+
+def start_tracing():
+    """Start tracemalloc; later snapshots are compared against this moment"""
+    global _trace_baseline
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(TRACE_FRAMES)
+    _trace_baseline = tracemalloc.take_snapshot()
+
+
+def stop_tracing():
+    global _trace_baseline
+    _trace_baseline = None
+    tracemalloc.stop()
+
+
+def trace_report():
+    """Largest allocation growth by source line since tracing started"""
+    if not tracemalloc.is_tracing():
+        return {'tracing': False}
+
+    snapshot = tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+    ])
+    current, peak = tracemalloc.get_traced_memory()
+    top = snapshot.compare_to(_trace_baseline, 'lineno') if _trace_baseline else snapshot.statistics('lineno')
+    return {
+        'tracing': True,
+        'traced_mb': round(current / 2 ** 20, 2),
+        'traced_peak_mb': round(peak / 2 ** 20, 2),
+        'top': [{
+            'location': str(stat.traceback[0]),
+            'size_kb': round(stat.size / 1024, 1),
+            'size_diff_kb': round(getattr(stat, 'size_diff', stat.size) / 1024, 1),
+            'count': stat.count,
+        } for stat in top[:TOP_ALLOCATIONS]],
+    }
+
+
+def report():
+    """Memory picture of this worker"""
+    with _stages_lock:
+        stages = {name: {k: round(v, 3) if isinstance(v, float) else v for k, v in stats.items()}
+                  for name, stats in sorted(_stages.items())}
+    return {
+        'pid': os.getpid(),
+        'requests_served': _requests_served,
+        'rss_mb': round(rss_mb(), 1),
+        'peak_rss_mb': round(lifetime_peak_rss_mb(), 1),
+        'figures': figure_counts(),
+        'gc_counts': gc.get_count(),
+        'stages': stages,
+        'tracemalloc': trace_report(),
+    }
+
+
+def _begin_request():
+    reset_peak()
+    g.memory_start = (time.perf_counter(), rss_mb())
+
+
+def _end_request(exc):
+    global _requests_served
+    _requests_served += 1
+    start = g.pop('memory_start', None)
+    if start is not None:
+        started, start_rss = start
+        record(f"request:{request.endpoint}", time.perf_counter() - started, rss_mb() - start_rss, peak_rss_mb())
+
+
+def init_app(app):
+    """Record every request as a stage named after its endpoint"""
+    app.before_request(_begin_request)
+    app.teardown_request(_end_request)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+RPE Response Export
+Streams the normalized responses as CSV or Parquet a chunk of rows at a
+time, so a download never holds the whole encoded body in memory.
+"""
+
+from io import StringIO
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = None
+    pq = None
+
+# Columns exported, in order; internal helpers like sort_key stay out of the files
+EXPORT_COLUMNS = ['timestamp', 'date', 'session_period', 'session_key', 'player', 'rpe']
+
+CHUNK_ROWS = 5000
+
+
+def parquet_available():
+    return pq is not None
+
+
+def csv_chunks(df, chunk_rows=CHUNK_ROWS):
+    """Yield the responses as CSV text, one block of rows at a time"""
+    df = df[EXPORT_COLUMNS]
+    yield ','.join(EXPORT_COLUMNS) + '\n'
+    for start in range(0, len(df), chunk_rows):
+        out = StringIO()
+        df.iloc[start:start + chunk_rows].to_csv(out, header=False, index=False, date_format='%Y-%m-%dT%H:%M:%S')
+        yield out.getvalue()
+
+
+class _StreamSink:
+    """Write-only file object that hands bytes back as they are written.
+
+    Parquet footers record absolute row-group offsets, so tell() reports
+    the total bytes written even though earlier bytes have been drained.
+    """
+
+    closed = False
+
+    def __init__(self):
+        self.position = 0
+        self.pending = []
+
+    def write(self, data):
+        self.pending.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self.pending)
+        self.pending = []
+        return data
+
+
+def parquet_chunks(df, chunk_rows=CHUNK_ROWS):
+    """Yield the responses as a Parquet file, one row group per block of rows"""
+    if pq is None:
+        raise RuntimeError('Parquet export needs pyarrow (pip install pyarrow)')
+
+    df = df[EXPORT_COLUMNS]
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    sink = _StreamSink()
+    writer = pq.ParquetWriter(pa.PythonFile(sink, mode='w'), schema, compression='snappy')
+    try:
+        for start in range(0, len(df), chunk_rows):
+            chunk = pa.Table.from_pandas(df.iloc[start:start + chunk_rows], schema=schema, preserve_index=False)
+            writer.write_table(chunk)
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
@@ -0,0 +1,28 @@
+"""
+Gunicorn settings for the dashboard (loaded automatically from this directory).
+
+Workers are recycled gracefully, finishing the request in hand, after
+RPE_MAX_REQUESTS requests or once their RSS passes RPE_MAX_RSS_MB, so slow
+memory growth in a long-lived worker never reaches the dyno's limit.
+"""
+
+import os
+
+max_requests = int(os.environ.get('RPE_MAX_REQUESTS', 1000))
+# Spread restarts so workers don't all recycle at once
+max_requests_jitter = int(os.environ.get('RPE_MAX_REQUESTS_JITTER', 100))
+
+# Off by default: a full-season render briefly peaks well above the idle RSS,
+# so set this near the dyno's memory limit rather than the worker's usual size
+MAX_RSS_MB = float(os.environ.get('RPE_MAX_RSS_MB', 0))
+
+
+def post_request(worker, req, environ, resp):
+    if not MAX_RSS_MB:
+        return
+    import diagnostics  # Already loaded in the worker with the app
+    rss = diagnostics.rss_mb()
+    if rss > MAX_RSS_MB and worker.alive:
+        worker.log.info("Worker %s at %.0f MB RSS (limit %.0f MB); recycling after this request",
+                        worker.pid, rss, MAX_RSS_MB)
+        worker.alive = False
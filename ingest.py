@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+RPE Response Ingestion
+Validates, normalizes and dedupes raw form responses once at load time, so
+the chart code can rely on clean, typed data.
+"""
+
+import re
+from io import StringIO
+
+import pandas as pd
+
+# Google Form headers -> concise snake-case
+COLUMN_NAMES = {
+    'Timestamp': 'timestamp',
+    'Todays Date': 'date',
+    'Morning or Afternoon Session': 'session_period',
+    'Player Name': 'player',
+    'What is your rate of perceived exertion?': 'rpe',
+    'SessionKey': 'session_key',
+}
+
+# Valid RPE range (CR-10 scale, 0 = rest)
+RPE_MIN = 0
+RPE_MAX = 10
+
+# SessionKey looks like "2025-08-05 – Morning"; the dash is often mangled into 'â\x80\x93' or 'â€“',
+# and 'â' is a word character, so the separator is anything but an ASCII letter or digit
+SESSION_KEY_PATTERN = re.compile(r'^\s*(\d{4}-\d{1,2}-\d{1,2})[^0-9A-Za-z]+(morning|afternoon|am|pm)\b', re.IGNORECASE)
+SESSION_SEPARATOR = ' – '
+
+PERIODS = {'morning': 'Morning', 'am': 'Morning', 'afternoon': 'Afternoon', 'pm': 'Afternoon'}
+PERIOD_HOURS = {'Morning': 0, 'Afternoon': 12}
+
+
+def parse_responses(csv_text):
+    """Parse sheet CSV text into (clean responses, rejected rows)"""
+    return normalize_responses(pd.read_csv(StringIO(csv_text)))
+
+
+def normalize_responses(raw):
+    """Validate and normalize raw form responses.
+
+    Returns (clean, rejected). Every clean row has a player, a numeric RPE
+    in range, a canonical session_key ("YYYY-MM-DD – Morning"), and is the
+    only row for its player and session, keeping the latest Timestamp.
+    Rejected rows keep their original values plus a 'reason' column.
+    """
+    original = raw.rename(columns=COLUMN_NAMES)
+    missing = [c for c in ('player', 'rpe') if c not in original.columns]
+    if missing:
+        raise ValueError(f"Sheet is missing required columns: {', '.join(missing)}")
+    df = original.reindex(columns=list(COLUMN_NAMES.values()))
+
+    # First reason wins, so each rejected row is reported once
+    reasons = pd.Series(None, index=df.index, dtype='object')
+
+    def reject(mask, reason):
+        reasons[mask & reasons.isna()] = reason
+
+    # Players: trim, collapse whitespace, and fold case variants onto the most common spelling
+    player = df['player'].astype('string').str.strip().str.replace(r'\s+', ' ', regex=True)
+    player = player.mask(player == '')
+    folded = player.str.casefold()
+    spellings = player.groupby(folded).agg(lambda names: names.value_counts().index[0])
+    df['player'] = folded.map(spellings)
+    reject(df['player'].isna(), 'missing player')
+
+    # RPE: numeric and on the scale
+    rpe = pd.to_numeric(df['rpe'], errors='coerce')
+    reject(rpe.isna(), 'non-numeric RPE')
+    reject(~rpe.between(RPE_MIN, RPE_MAX), 'RPE out of range')
+    df['rpe'] = rpe
+
+    # Sessions: take date and period from SessionKey, falling back to the form's own columns
+    key_parts = df['session_key'].astype('string').str.extract(SESSION_KEY_PATTERN)
+    key_date = pd.to_datetime(key_parts[0], format='%Y-%m-%d', errors='coerce')
+    key_period = key_parts[1].str.lower().map(PERIODS)
+    form_date = pd.to_datetime(df['date'], errors='coerce')
+    form_period = df['session_period'].astype('string').str.strip().str.lower().map(PERIODS)
+
+    df['date'] = key_date.fillna(form_date).dt.normalize()
+    df['session_period'] = key_period.fillna(form_period)
+    reject(df['date'].isna() | df['session_period'].isna(), 'unrecognized session')
+    df['session_key'] = df['date'].dt.strftime('%Y-%m-%d') + SESSION_SEPARATOR + df['session_period']
+    df['sort_key'] = df['date'] + pd.to_timedelta(df['session_period'].map(PERIOD_HOURS), unit='hours')
+
+    df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
+
+    rejected = original[reasons.notna()].assign(reason=reasons[reasons.notna()])
+    clean = df[reasons.isna()]
+
+    # Resubmissions: the latest Timestamp wins; stable sort keeps sheet order for ties
+    clean = clean.sort_values('timestamp', kind='stable', na_position='first')
+    duplicate = clean.duplicated(['player', 'session_key'], keep='last')
+    rejected = pd.concat([rejected, original.loc[clean.index[duplicate]].assign(reason='duplicate submission')])
+
+    clean = clean[~duplicate].sort_values('sort_key', kind='stable').reset_index(drop=True)
+    clean = clean.astype({'player': object, 'session_key': object, 'session_period': object})
+    return clean, rejected
+
+
+def format_session_label(session, separator=' '):
+    """Format a canonical session key like '2025-08-05 – Morning' as '8/05 AM'"""
+    date_str, period = session.split(SESSION_SEPARATOR)
+    period_short = 'AM' if period == 'Morning' else 'PM'
+    return f"{pd.Timestamp(date_str).strftime('%-m/%d')}{separator}{period_short}"
+
+
+def rejection_summary(rejected):
+    """Count rejected rows by reason"""
+    return {reason: int(count) for reason, count in rejected['reason'].value_counts().items()}
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Dashboard Load Test
+Runs app.py under gunicorn against the mock Google Sheet and simulates
+coaches opening the dashboard and leaving auto-refresh on. Reports latency
+percentiles, throughput, CPU time and per-worker RSS for each gunicorn
+configuration.
+
+    python load_test.py --coaches 12 --duration 120 --workers 1,2,4 --worker-class sync,gthread
+"""
+
+import argparse
+import os
+import random
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import requests
+
+import mock_sheet_server
+
+IMAGE_SRC = re.compile(r'<img[^>]*\ssrc="([^"]+)"')
+
+
+class Results:
+    """Latencies and failures collected from every simulated coach"""
+
+    def __init__(self):
+        self.latencies = {'page': [], 'image': []}
+        self.statuses = {}
+        self.errors = 0
+        self.lock = threading.Lock()
+
+    def record(self, kind, seconds, status):
+        with self.lock:
+            self.latencies[kind].append(seconds)
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def record_error(self):
+        with self.lock:
+            self.errors += 1
+
+
+def image_urls(html):
+    """Chart URLs a desktop browser would fetch for this page (one per <img>)"""
+    return {url.replace('&amp;', '&') for url in IMAGE_SRC.findall(html) if url.startswith('/charts/')}
+
+
+def simulate_coach(base_url, results, stop_at, ramp, poll_interval, fetch_images):
+    """Open the dashboard, then reload it every poll_interval like the auto-refresh button"""
+    session = requests.Session()
+    session.headers['Accept-Encoding'] = 'gzip, br'
+    etag = None
+    fetched = set()  # Chart URLs are immutable, so a browser only downloads each once
+
+    time.sleep(random.uniform(0, ramp))
+    while time.time() < stop_at:
+        headers = {'If-None-Match': etag} if etag else {}
+        started = time.perf_counter()
+        try:
+            response = session.get(f"{base_url}/", headers=headers, timeout=120)
+            results.record('page', time.perf_counter() - started, response.status_code)
+        except requests.RequestException:
+            results.record_error()
+            time.sleep(1)
+            continue
+
+        if response.status_code == 200:
+            etag = response.headers.get('ETag')
+            if fetch_images:
+                for url in image_urls(response.text) - fetched:
+                    started = time.perf_counter()
+                    try:
+                        image = session.get(f"{base_url}{url}", timeout=120)
+                        results.record('image', time.perf_counter() - started, image.status_code)
+                        fetched.add(url)
+                    except requests.RequestException:
+                        results.record_error()
+
+        time.sleep(max(0.0, min(poll_interval, stop_at - time.time())))
+
+
+def child_pids(parent_pid):
+    """PIDs whose parent is parent_pid (Linux /proc)"""
+    pids = []
+    for entry in Path('/proc').iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / 'stat').read_text()
+        except OSError:
+            continue
+        # The command name may contain spaces, so split after its closing parenthesis
+        fields = stat[stat.rindex(')') + 2:].split()
+        if int(fields[1]) == parent_pid:
+            pids.append(int(entry.name))
+    return pids
+
+
+def rss_mb(pid):
+    try:
+        for line in Path(f'/proc/{pid}/status').read_text().splitlines():
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def cpu_seconds(pid):
+    """User + system CPU time of a process"""
+    try:
+        stat = Path(f'/proc/{pid}/stat').read_text()
+    except OSError:
+        return 0.0
+    fields = stat[stat.rindex(')') + 2:].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+
+
+def watch_workers(master_pid, peaks, cpu, stop):
+    """Track peak RSS and CPU time of every gunicorn worker until stop is set"""
+    while not stop.is_set():
+        for pid in child_pids(master_pid):
+            rss = rss_mb(pid)
+            if rss is not None:
+                peaks[pid] = max(peaks.get(pid, 0), rss)
+            cpu[pid] = max(cpu.get(pid, 0.0), cpu_seconds(pid))
+        stop.wait(0.5)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def run_config(args, sheet_url, worker_class, workers):
+    """Start gunicorn with one configuration, drive it with coaches, and summarize"""
+    port = free_port()
+    # A fresh render cache per configuration so every run starts cold
+    cache_dir = tempfile.mkdtemp(prefix='rpe_load_test_')
+    env = dict(os.environ, GOOGLE_SHEET_URL=sheet_url, RPE_CACHE_DIR=cache_dir)
+    command = [sys.executable, '-m', 'gunicorn', 'app:app',
+               '--bind', f'127.0.0.1:{port}',
+               '--workers', str(workers),
+               '--worker-class', worker_class,
+               '--threads', str(args.threads),
+               '--timeout', '300']
+    server = subprocess.Popen(command, env=env, cwd=Path(__file__).parent,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        if not wait_for_port(port):
+            raise RuntimeError(f"gunicorn did not start on port {port}")
+
+        results = Results()
+        peaks, cpu, stop = {}, {}, threading.Event()
+        watcher = threading.Thread(target=watch_workers, args=(server.pid, peaks, cpu, stop), daemon=True)
+        watcher.start()
+
+        started = time.time()
+        stop_at = started + args.duration
+        coaches = [threading.Thread(target=simulate_coach,
+                                    args=(f"http://127.0.0.1:{port}", results, stop_at,
+                                          args.ramp, args.poll_interval, not args.no_images))
+                   for _ in range(args.coaches)]
+        for coach in coaches:
+            coach.start()
+        for coach in coaches:
+            coach.join()
+        elapsed = time.time() - started
+
+        stop.set()
+        watcher.join()
+        return summarize(worker_class, workers, results, elapsed, peaks, cpu)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def summarize(worker_class, workers, results, elapsed, peaks, cpu):
+    summary = {
+        'worker_class': worker_class,
+        'workers': workers,
+        'requests': sum(len(v) for v in results.latencies.values()),
+        'errors': results.errors,
+        'statuses': dict(sorted(results.statuses.items())),
+        'throughput': sum(len(v) for v in results.latencies.values()) / elapsed,
+        'cpu_seconds': sum(cpu.values()),
+        'worker_rss_mb': sorted(round(v, 1) for v in peaks.values()),
+    }
+    for kind, latencies in results.latencies.items():
+        if latencies:
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+            summary[kind] = {'count': len(latencies), 'p50': p50, 'p95': p95, 'p99': p99}
+    return summary
+
+
+def print_summary(summary):
+    print(f"\n⚙️  {summary['worker_class']} x {summary['workers']} workers")
+    print(f"   requests: {summary['requests']}  errors: {summary['errors']}  statuses: {summary['statuses']}")
+    print(f"   throughput: {summary['throughput']:.2f} req/s  worker CPU: {summary['cpu_seconds']:.1f}s")
+    for kind in ('page', 'image'):
+        if kind in summary:
+            s = summary[kind]
+            print(f"   {kind:>5}: n={s['count']:<5} p50={s['p50'] * 1000:.0f}ms  "
+                  f"p95={s['p95'] * 1000:.0f}ms  p99={s['p99'] * 1000:.0f}ms")
+    print(f"   peak RSS per worker (MB): {summary['worker_rss_mb']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the dashboard under gunicorn')
+    parser.add_argument('--coaches', type=int, default=12, help='simulated coaches')
+    parser.add_argument('--duration', type=float, default=60, help='seconds per configuration')
+    parser.add_argument('--ramp', type=float, default=5, help='coaches open the page within this many seconds')
+    parser.add_argument('--poll-interval', type=float, default=30, help='auto-refresh interval')
+    parser.add_argument('--workers', default='1,2', help='comma-separated worker counts')
+    parser.add_argument('--worker-class', default='sync,gthread', help='comma-separated gunicorn worker classes')
+    parser.add_argument('--threads', type=int, default=4, help='threads per worker for gthread')
+    parser.add_argument('--no-images', action='store_true', help='only load the HTML page')
+    parser.add_argument('--sheet-url', help='use this sheet instead of starting the mock sheet')
+    parser.add_argument('--players', type=int, default=28)
+    parser.add_argument('--days', type=int, default=20)
+    parser.add_argument('--sheet-latency', type=float, default=0.3)
+    parser.add_argument('--growth-rows', type=int, default=0, help='mock sheet rows added per growth interval')
+    parser.add_argument('--growth-interval', type=float, default=60)
+    args = parser.parse_args()
+
+    sheet_url = args.sheet_url
+    if sheet_url is None:
+        _, sheet_url = mock_sheet_server.start_server(players=args.players,
+                                                      days=args.days,
+                                                      latency=args.sheet_latency,
+                                                      growth_rows=args.growth_rows,
+                                                      growth_interval=args.growth_interval)
+
+    print("🏋️ Dashboard load test")
+    print(f"📄 Sheet: {sheet_url}")
+    print(f"👥 {args.coaches} coaches, {args.duration:.0f}s per configuration, refresh every {args.poll_interval:.0f}s")
+
+    for worker_class in args.worker_class.split(','):
+        for workers in (int(w) for w in args.workers.split(',')):
+            print_summary(run_config(args, sheet_url, worker_class, workers))
+
+
+if __name__ == '__main__':
+    main()
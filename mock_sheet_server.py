@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Mock Google Sheet Server
+Serves the sheet's CSV export from synthetic RPE responses, so the dashboard
+can be run and load-tested without touching the real Google Sheet.
+
+    python mock_sheet_server.py --port 8001 --players 28 --days 30 --latency 0.3
+    GOOGLE_SHEET_URL=http://localhost:8001/export?format=csv python app.py
+"""
+
+import argparse
+import csv
+import hashlib
+import random
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+
+COLUMNS = [
+    'Timestamp',
+    'Todays Date',
+    'Morning or Afternoon Session',
+    'Player Name',
+    'What is your rate of perceived exertion?',
+    'SessionKey',
+]
+
+SEASON_START = date(2025, 8, 5)
+
+
+class SyntheticSheet:
+    """Form responses for a squad, one session at a time, optionally growing while served"""
+
+    def __init__(self, players=28, days=20, seed=0, submit_rate=0.9, growth_rows=0, growth_interval=60):
+        self.players = players
+        self.submit_rate = submit_rate
+        self.growth_rows = growth_rows
+        self.growth_interval = growth_interval
+        self.random = random.Random(seed)
+        self.rows = []
+        self.sessions = 0
+        self.lock = threading.Lock()
+        self.last_growth = time.time()
+
+        for _ in range(days * 2):
+            self.add_session()
+        self._render()
+
+    def add_session(self):
+        """Append one practice session's worth of responses"""
+        day = SEASON_START + timedelta(days=self.sessions // 2)
+        period = 'Morning' if self.sessions % 2 == 0 else 'Afternoon'
+        hour = 9 if period == 'Morning' else 15
+        for number in range(1, self.players + 1):
+            if self.random.random() > self.submit_rate:
+                continue
+            self.rows.append([
+                f"{day.month}/{day.day}/{day.year} {hour}:{self.random.randint(10, 59)}:00",
+                f"{day.month}/{day.day}/{day.year}",
+                period,
+                f"{number} Player{number}",
+                self.random.randint(1, 10),
+                f"{day.isoformat()} – {period}",
+            ])
+        self.sessions += 1
+
+    def grow(self):
+        """Add growth_rows rows per elapsed growth_interval, mimicking live submissions"""
+        if not self.growth_rows:
+            return
+        with self.lock:
+            intervals = int((time.time() - self.last_growth) // self.growth_interval)
+            if intervals <= 0:
+                return
+            self.last_growth += intervals * self.growth_interval
+            target = len(self.rows) + intervals * self.growth_rows
+            while len(self.rows) < target:
+                self.add_session()
+            self._render()
+
+    def _render(self):
+        out = StringIO()
+        writer = csv.writer(out)
+        writer.writerow(COLUMNS)
+        writer.writerows(self.rows)
+        self.body = out.getvalue().encode('utf-8')
+        self.etag = '"' + hashlib.sha1(self.body).hexdigest() + '"'
+
+
+def make_handler(sheet, latency=0.0, jitter=0.0, failure_rate=0.0, etags=True):
+    """Build a request handler serving sheet with the given network behaviour"""
+
+    class MockSheetHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            if 'export' not in self.path:
+                self.send_error(404)
+                return
+
+            delay = latency + random.uniform(0, jitter)
+            if delay > 0:
+                time.sleep(delay)
+
+            if random.random() < failure_rate:
+                self.send_error(503, 'Simulated failure')
+                return
+
+            sheet.grow()
+            body, etag = sheet.body, sheet.etag
+
+            if etags and self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/csv; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            if etags:
+                self.send_header('ETag', etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MockSheetHandler
+
+
+def start_server(port=0, **options):
+    """Start a mock sheet in a background thread and return (server, export_url)"""
+    handler_options = {k: options.pop(k) for k in ('latency', 'jitter', 'failure_rate', 'etags') if k in options}
+    sheet = SyntheticSheet(**options)
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(sheet, **handler_options))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/export?format=csv"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a synthetic RPE sheet as a CSV export')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--players', type=int, default=28)
+    parser.add_argument('--days', type=int, default=20, help='practice days to pre-populate (two sessions each)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='extra random latency, up to this many seconds')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='fraction of requests answered with 503')
+    parser.add_argument('--no-etags', action='store_true', help='omit ETag headers and ignore If-None-Match')
+    parser.add_argument('--growth-rows', type=int, default=0, help='rows added per growth interval')
+    parser.add_argument('--growth-interval', type=float, default=60, help='seconds between growth steps')
+    args = parser.parse_args()
+
+    server, url = start_server(port=args.port,
+                               players=args.players,
+                               days=args.days,
+                               seed=args.seed,
+                               growth_rows=args.growth_rows,
+                               growth_interval=args.growth_interval,
+                               latency=args.latency,
+                               jitter=args.jitter,
+                               failure_rate=args.failure_rate,
+                               etags=not args.no_etags)
+
+    print("🧪 Mock Google Sheet running")
+    print(f"📄 Export URL: {url}")
+    print(f"🔗 Point the dashboard at it: GOOGLE_SHEET_URL='{url}' python app.py")
+    print("⏹️  Press Ctrl+C to stop")
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping mock sheet...")
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
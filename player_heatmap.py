@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Player RPE Heatmap
+Draws the roster as one players x sessions heatmap. Shared by the web
+dashboard and the rpe.py script, so it only depends on matplotlib and numpy.
+"""
+
+import matplotlib
+import numpy as np
+
+
+def heatmap_figsize(n_players):
+    return (16, max(4, n_players * 0.3 + 2))
+
+
+def draw_player_heatmap(fig, rpe_grid, session_labels, alert_mask=None):
+    """Draw a players x sessions RPE frame onto fig, with missed sessions greyed out
+    and the cells set in alert_mask outlined"""
+    values = rpe_grid.to_numpy(dtype=float)
+    n_players, n_sessions = values.shape
+    ax = fig.subplots()
+
+    cmap = matplotlib.colormaps['RdYlGn_r'].copy()
+    cmap.set_bad('#e0e0e0')
+    image = ax.imshow(np.ma.masked_invalid(values), cmap=cmap, vmin=0, vmax=10,
+                      aspect='auto', interpolation='nearest')
+
+    # Mark every missing submission with one scatter call rather than a text artist per cell
+    missing_rows, missing_cols = np.nonzero(np.isnan(values))
+    ax.scatter(missing_cols, missing_rows, marker='x', s=12, color='#9e9e9e', linewidths=0.8)
+    if alert_mask is not None:
+        flagged_rows, flagged_cols = np.nonzero(alert_mask)
+        ax.scatter(flagged_cols, flagged_rows, marker='s', s=60, facecolors='none', edgecolors='black', linewidths=1.5)
+
+    ax.set_yticks(np.arange(n_players))
+    ax.set_yticklabels(rpe_grid.index, fontsize=8)
+    ax.set_xticks(np.arange(n_sessions))
+    ax.set_xticklabels(session_labels, rotation=90, fontsize=7)
+    ax.grid(False)
+    ax.set_xlabel('Session')
+    ax.set_title('Player RPE Heatmap - All Sessions (x = no submission)', fontsize=14)
+    fig.colorbar(image, ax=ax, label='RPE', fraction=0.03, pad=0.01)
+    fig.tight_layout()
+    return fig
+
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Player PDF Reports
+Writes one PDF report per player for the current season. The sheet is
+loaded and parsed once; report workers run in a process pool and receive
+that dataset when they start (inherited copy-on-write where fork is
+available), then report total time and peak memory.
+
+    python player_reports.py --output reports --workers 4
+"""
+
+import argparse
+import multiprocessing
+import os
+import re
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from matplotlib.backends.backend_pdf import FigureCanvasPdf
+from matplotlib.figure import Figure
+
+import app
+
+# Set in each worker by init_worker
+_dataset = {}
+
+
+def load_dataset(season=None):
+    """Parse the sheet once and keep one season's responses: the current one by default,
+    or an earlier season from the archive, exactly as the player pages show them"""
+    csv_text, version = app.load_sheet()
+    return app.get_season_responses(csv_text, version, season)
+
+
+def init_worker(df, sessions, season, output_dir):
+    _dataset.update(df=df, sessions=sessions, season=season, output_dir=Path(output_dir))
+
+
+def report_filename(player):
+    return re.sub(r'[^\w-]+', '_', player).strip('_') + '.pdf'
+
+
+def render_report(player):
+    """Write one player's report and return its timing and size"""
+    started = time.perf_counter()
+    history = app.player_history(_dataset['df'], player, _dataset['sessions'])
+    logged = history['rpe'].dropna()
+    acwr = history['acwr'].dropna()
+
+    fig = Figure(figsize=(8.5, 11))
+    FigureCanvasPdf(fig)
+    header, rpe_ax, load_ax = fig.subplots(3, 1, gridspec_kw={'height_ratios': [1, 3, 3]})
+
+    header.axis('off')
+    header.text(0, 0.8, f"{player} — {_dataset['season']} season", fontsize=18, weight='bold')
+    stats = [
+        f"Sessions logged: {len(logged)} / {len(history)}",
+        f"Average RPE: {logged.mean():.1f}" if len(logged) else "Average RPE: —",
+        f"Latest ACWR: {acwr.iloc[-1]:.2f}" if len(acwr) else "Latest ACWR: —",
+    ]
+    header.text(0, 0.2, '     '.join(stats), fontsize=11)
+
+    app.plot_player_history(rpe_ax, history, player)
+    app.plot_player_history(load_ax, history, player, metrics=True)
+    load_ax.set_title('Training Load', fontsize=12)
+    fig.tight_layout()
+
+    path = _dataset['output_dir'] / report_filename(player)
+    fig.savefig(path, format='pdf')
+    return {
+        'player': player,
+        'path': str(path),
+        'bytes': path.stat().st_size,
+        'seconds': time.perf_counter() - started,
+        'pid': os.getpid(),
+    }
+
+
+def peak_rss_mb(who):
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(who).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write one PDF report per player')
+    parser.add_argument('--output', default='reports', help='directory for the PDFs')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='report processes')
+    parser.add_argument('--season', help="season label such as 2025-26 (default: the latest)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    try:
+        df, sessions, season = load_dataset(args.season)
+    except KeyError:
+        parser.error(f"no responses for season {args.season}")
+    players = app.sort_players(df['player'].unique())
+    output_dir = Path(args.output)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    loaded = time.perf_counter()
+    print(f"📊 Loaded {len(df)} responses for {len(players)} players ({season}) in {loaded - started:.1f}s")
+
+    # With fork the workers inherit the parsed frame instead of unpickling a copy each
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=context,
+                             initializer=init_worker,
+                             initargs=(df, sessions, season, output_dir)) as pool:
+        reports = list(pool.map(render_report, players))
+
+    elapsed = time.perf_counter() - started
+    for report in reports:
+        print(f"   📄 {report['path']} ({report['bytes'] / 1024:.0f} KB, {report['seconds']:.2f}s)")
+    print(f"✅ {len(reports)} reports in {elapsed:.1f}s "
+          f"({elapsed - (loaded - started):.1f}s rendering on {len({r['pid'] for r in reports})} processes)")
+    print(f"💾 Peak RSS: parent {peak_rss_mb(resource.RUSAGE_SELF):.0f} MB, "
+          f"largest worker {peak_rss_mb(resource.RUSAGE_CHILDREN):.0f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -7,6 +7,11 @@ import numpy as np
 from pathlib import Path
 import requests
 from io import StringIO
+import os
+import sys
+
+import ingest
+import player_heatmap
 
 # === REPLACE WITH YOUR GOOGLE SHEET INFO ===
 # Option 1: Direct CSV export from public Google Sheet
@@ -24,6 +29,9 @@ output_dir = "/Users/ericwnorowski/Desktop/cofc-soccer-rpe-dashboard"
 # output_dir = "/Users/ericwnorowski/Google Drive/CofC_Soccer_RPE_Charts"  # Google Drive
 # output_dir = "/Users/ericwnorowski/Library/Mobile Documents/com~apple~CloudDocs/CofC_Soccer_RPE_Charts"  # iCloud
 
+# Player chart style: 'grid' (one line chart per player) or 'heatmap' (one players x sessions heatmap)
+player_view = os.environ.get('RPE_PLAYER_VIEW', 'grid')
+
 # Ensure output directory exists
 Path(output_dir).mkdir(parents=True, exist_ok=True)
 
@@ -158,6 +166,27 @@ def extract_player_number(player_name):
 
 players_sorted = sorted(players, key=extract_player_number)
 n_players = len(players_sorted)
+
+if player_view == 'heatmap':
+    # Normalize like the web dashboard: canonical session keys, latest resubmission wins
+    clean, _ = ingest.normalize_responses(df)
+    heatmap_sessions = clean.drop_duplicates('session_key')['session_key'].tolist()
+    rpe_grid = (clean.pivot(index='player', columns='session_key', values='rpe')
+                .reindex(index=sorted(clean['player'].unique(), key=extract_player_number), columns=heatmap_sessions))
+    
+    fig = plt.figure(figsize=player_heatmap.heatmap_figsize(len(rpe_grid)))
+    player_heatmap.draw_player_heatmap(fig, rpe_grid, [ingest.format_session_label(s) for s in heatmap_sessions])
+    
+    output_path = Path(output_dir) / "CofC_Mens_Soccer_RPE_players.png"
+    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    plt.close()
+    
+    print(f"Charts saved to {output_dir}")
+    print(f"Sessions analyzed: {heatmap_sessions}")
+    print(f"Total players: {len(rpe_grid)}")
+    print("Generated files: CofC_Mens_Soccer_RPE_avg.png, CofC_Mens_Soccer_RPE_distribution.png, CofC_Mens_Soccer_RPE_players.png")
+    sys.exit()
+
 cols = 4  # Auto-wrap in 4 columns
 rows = (n_players + cols - 1) // cols  # Calculate needed rows
 
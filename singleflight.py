@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Request coalescing (single-flight) for the RPE dashboard
+Concurrent callers asking for the same key share one computation, both
+between threads of a worker and between gunicorn worker processes.
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Shared by every worker on the host; results are JSON files next to their lock files
+CACHE_DIR = Path(os.environ.get('RPE_CACHE_DIR', Path(tempfile.gettempdir()) / 'rpe_dashboard_cache'))
+
+# Results unused for this long are removed the next time anything is stored
+CACHE_TTL_SECONDS = 60 * 60
+
+# Immutable results never go stale, so they are kept by recent use rather than age;
+# an unchanged sheet's dashboard survives idle hours and keeps its ETag
+IMMUTABLE_DIR = CACHE_DIR / 'immutable'
+IMMUTABLE_KEEP = 8
+
+
+class _Call:
+    """An in-progress computation that other threads can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+_calls = {}
+_calls_lock = threading.Lock()
+
+
+def do(key, fn, immutable=False):
+    """Run fn() once for every concurrent caller asking for key.
+
+    Within a process, the first caller runs fn and the others wait for its
+    result. Across processes, callers serialize on a lock file and reuse the
+    result the winner leaves behind. With immutable=False a stored result is
+    only reused if it finished after the caller started waiting, so nobody
+    gets data older than their own request. Set immutable=True when the key
+    already names a data version and any stored result is valid.
+    """
+    with _calls_lock:
+        call = _calls.get(key)
+        leader = call is None
+        if leader:
+            call = _Call()
+            _calls[key] = call
+
+    if not leader:
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    try:
+        call.result = _do_shared(key, fn, immutable)
+        return call.result
+    except Exception as e:
+        call.error = e
+        raise
+    finally:
+        with _calls_lock:
+            _calls.pop(key, None)
+        call.done.set()
+
+
+def peek(key):
+    """Return the stored result for an immutable key, or None if nobody has computed it"""
+    name = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    result_path = IMMUTABLE_DIR / f"{name}.json"
+    stored = _read_result(result_path)
+    if stored is None:
+        return None
+    _touch(result_path)
+    return stored['result']
+
+
+def _do_shared(key, fn, immutable):
+    """Coalesce fn() across worker processes through a lock file"""
+    name = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    lock_path = CACHE_DIR / f"{name}.lock"
+    result_path = (IMMUTABLE_DIR if immutable else CACHE_DIR) / f"{name}.json"
+    result_path.parent.mkdir(parents=True, exist_ok=True)
+    started = 0 if immutable else time.time()
+
+    with open(lock_path, 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            stored = _read_result(result_path)
+            if stored is not None and stored['finished'] >= started:
+                _touch(result_path)
+                return stored['result']
+
+            result = fn()
+            _write_result(result_path, result)
+            return result
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _read_result(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _touch(path):
+    """Mark a stored result as used, so pruning keeps results that are still being served"""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def _write_result(path, result):
+    """Store a result atomically so readers never see a partial file"""
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump({'finished': time.time(), 'result': result}, f)
+    os.replace(tmp_path, path)
+    _prune_cache()
+
+
+def _last_used(path):
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return 0
+
+
+def _prune_cache():
+    """Drop results (and their locks) unused for CACHE_TTL_SECONDS, and all but the
+    IMMUTABLE_KEEP most recently used immutable results"""
+    cutoff = time.time() - CACHE_TTL_SECONDS
+    expired = [path for path in CACHE_DIR.glob('*.json') if _last_used(path) < cutoff]
+    immutable = sorted(IMMUTABLE_DIR.glob('*.json'), key=_last_used, reverse=True)
+    for path in expired + immutable[IMMUTABLE_KEEP:]:
+        try:
+            path.unlink()
+            (CACHE_DIR / f"{path.stem}.lock").unlink(missing_ok=True)
+        except OSError:
+            pass
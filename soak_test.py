@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Chart Rendering Soak Test
+Renders the dashboard charts thousands of times in one process against a
+synthetic sheet and samples RSS and live matplotlib figures as it goes.
+Exits non-zero if RSS trends upward once the worker has warmed up.
+
+    python soak_test.py --iterations 2000 --charts avg,distribution,heatmap,grid,player
+"""
+
+import argparse
+import gc
+import itertools
+import sys
+import time
+from io import BytesIO
+
+import numpy as np
+
+import app
+import diagnostics
+import mock_sheet_server
+
+
+def save_png(fig):
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
+    return len(buffer.getvalue())
+
+
+def chart_renderers(df, sessions, players):
+    """One zero-argument render function per chart type"""
+    player_cycle = itertools.cycle(players)
+    return {
+        'avg': lambda: app.generate_avg_chart(df, sessions, save=save_png),
+        'distribution': lambda: app.generate_distribution_chart(df, sessions, save=save_png),
+        'heatmap': lambda: app.generate_player_heatmap(df, sessions, save=save_png),
+        'grid': lambda: app.generate_player_dashboard(df, sessions, save=save_png),
+        'player': lambda: len(app.generate_player_chart(
+            app.player_history(df, player := next(player_cycle), sessions), player, metrics=True)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render charts repeatedly and check memory stays flat')
+    parser.add_argument('--iterations', type=int, default=2000, help='total chart renders')
+    parser.add_argument('--charts', default='avg,distribution,heatmap,grid,player',
+                        help='comma-separated charts to cycle through (avg, distribution, heatmap, grid, player)')
+    parser.add_argument('--sample-every', type=int, default=100, help='renders between memory samples')
+    # The grid's large Agg buffers take a few hundred renders for the allocator to settle
+    parser.add_argument('--warmup', type=float, default=0.25, help='fraction of renders ignored as warm-up')
+    parser.add_argument('--max-trend-mb', type=float, default=5,
+                        help='allowed RSS growth per 1000 renders after warm-up, from a linear fit')
+    parser.add_argument('--players', type=int, default=28)
+    parser.add_argument('--days', type=int, default=10)
+    parser.add_argument('--trace', action='store_true', help='report the top allocation growth with tracemalloc')
+    args = parser.parse_args()
+
+    sheet = mock_sheet_server.SyntheticSheet(players=args.players, days=args.days)
+    df = app.parse_data(sheet.body.decode('utf-8'))
+    sessions = df.drop_duplicates('session_key').sort_values('sort_key')['session_key'].tolist()
+    renderers = chart_renderers(df, sessions, app.sort_players(df['player'].unique()))
+    charts = args.charts.split(',')
+
+    print(f"🧪 Soak test: {args.iterations} renders of {', '.join(charts)} "
+          f"({len(df)} responses, {len(sessions)} sessions)")
+    print(f"{'renders':>8} {'seconds':>8} {'RSS MB':>8} {'pyplot':>7} {'figures':>8}")
+
+    warmup = int(args.iterations * args.warmup)
+    samples = []
+    started = time.perf_counter()
+    for i in range(1, args.iterations + 1):
+        renderers[charts[i % len(charts)]]()
+        if i == warmup and args.trace:
+            diagnostics.start_tracing()
+        if i % args.sample_every == 0 or i == args.iterations:
+            # Sample what is retained, not garbage awaiting the cyclic collector or freed heap
+            # the allocator hasn't returned yet
+            gc.collect()
+            diagnostics.release_free_memory()
+            figures = diagnostics.figure_counts()
+            rss = diagnostics.rss_mb()
+            samples.append((i, rss))
+            print(f"{i:>8} {time.perf_counter() - started:>8.1f} {rss:>8.1f} "
+                  f"{figures['pyplot']:>7} {figures['alive']:>8}")
+
+    steady = [(i, rss) for i, rss in samples if i >= warmup]
+    renders, rss = np.array(steady).T
+    growth = rss[-1] - rss[0]
+    slope = np.polyfit(renders, rss, 1)[0] * 1000 if len(steady) > 1 else 0.0
+    print(f"\n📈 RSS after warm-up: {rss[0]:.1f} → {rss[-1]:.1f} MB "
+          f"({growth:+.1f} MB, trend {slope:+.2f} MB per 1000 renders)")
+    gc.collect()
+    print(f"💾 Peak RSS: {diagnostics.lifetime_peak_rss_mb():.1f} MB; "
+          f"figures alive after a full collection: {diagnostics.figure_counts()['alive']}")
+
+    if args.trace:
+        print("\n🔎 Top allocation growth since warm-up:")
+        for stat in diagnostics.trace_report()['top'][:10]:
+            print(f"   {stat['size_diff_kb']:>+9.1f} KB  {stat['location']}")
+
+    # Allocator reuse makes single samples swing by tens of MB, so judge the fitted trend
+    if slope > args.max_trend_mb:
+        print(f"❌ RSS trends up {slope:.2f} MB per 1000 renders after warm-up (limit {args.max_trend_mb} MB)")
+        sys.exit(1)
+    print("✅ Memory is flat")
+
+
+if __name__ == '__main__':
+    main()
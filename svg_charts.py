@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Direct SVG chart writer
+Builds SVG markup for the bar and line charts straight from their values,
+without matplotlib's figure, layout and artist machinery. Geometry matches
+the matplotlib charts at 150 DPI so either backend fills the same box.
+"""
+
+import math
+from xml.sax.saxutils import escape
+
+# Matplotlib point sizes at 150 DPI
+PX_PER_PT = 150 / 72
+
+BAR_COLOR = '#87ceeb'
+LINE_COLOR = '#1f77b4'
+ALERT_COLOR = 'red'
+
+STYLE = (
+    "text{font-family:'DejaVu Sans',Arial,sans-serif;fill:#000}"
+    ".axis{stroke:#000;stroke-width:1.5;fill:none}"
+    ".grid{stroke:#b0b0b0;stroke-opacity:.3;stroke-width:1.6}"
+    ".tick{stroke:#000;stroke-width:1.6}"
+)
+
+
+def _number(value):
+    """Compact coordinate: one decimal place, no trailing zeros"""
+    return f"{value:.1f}".rstrip('0').rstrip('.')
+
+
+def _text(x, y, text, size, anchor='middle', rotate=None, extra=''):
+    transform = f' transform="rotate({rotate} {_number(x)} {_number(y)})"' if rotate is not None else ''
+    return (f'<text x="{_number(x)}" y="{_number(y)}" font-size="{_number(size)}" '
+            f'text-anchor="{anchor}"{transform}{extra}>{escape(str(text))}</text>')
+
+
+def _document(width, height, body):
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+            f'viewBox="0 0 {width} {height}"><style>{STYLE}</style>'
+            f'<rect width="{width}" height="{height}" fill="#fff"/>{"".join(body)}</svg>')
+
+
+def _label_drop(labels, size, angle=45):
+    """Vertical room taken by rotated tick labels (glyphs average ~0.6em wide)"""
+    longest = max((len(label) for label in labels), default=0) * 0.6 * size
+    return longest * math.sin(math.radians(angle)) + size
+
+
+def _y_axis(body, left, top, width, height, ymax, size, grid=False, ticks=range(0, 11, 2)):
+    """Y ticks, labels and optional horizontal grid lines for a 0..ymax axis"""
+    for value in ticks:
+        y = top + height - value / ymax * height
+        if grid:
+            body.append(f'<line class="grid" x1="{_number(left)}" y1="{_number(y)}" '
+                        f'x2="{_number(left + width)}" y2="{_number(y)}"/>')
+        body.append(f'<line class="tick" x1="{_number(left - 7)}" y1="{_number(y)}" '
+                    f'x2="{_number(left)}" y2="{_number(y)}"/>')
+        body.append(_text(left - 11, y + size * 0.35, value, size, anchor='end'))
+
+
+def bar_chart(labels, values, title, xlabel, ylabel, ymax=10, width=1500, height=900):
+    """Vertical bar chart; NaN values leave an empty slot. Returns (svg, width, height)"""
+    tick_size = 10 * PX_PER_PT
+    left, right, top = 110, 30, 70
+    bottom = _label_drop(labels, tick_size) + 70
+    plot_w, plot_h = width - left - right, height - top - bottom
+
+    body = [_text(width / 2, top - 25, title, 12 * PX_PER_PT)]
+    _y_axis(body, left, top, plot_w, plot_h, ymax, tick_size)
+
+    slot = plot_w / max(len(values), 1)
+    for i, (label, value) in enumerate(zip(labels, values)):
+        center = left + (i + 0.5) * slot
+        if value is not None and not math.isnan(value):
+            bar_h = min(value, ymax) / ymax * plot_h
+            body.append(f'<rect x="{_number(center - slot * 0.4)}" y="{_number(top + plot_h - bar_h)}" '
+                        f'width="{_number(slot * 0.8)}" height="{_number(bar_h)}" '
+                        f'fill="{BAR_COLOR}" fill-opacity=".7"><title>{escape(label)}: {value:.2f}</title></rect>')
+        body.append(f'<line class="tick" x1="{_number(center)}" y1="{_number(top + plot_h)}" '
+                    f'x2="{_number(center)}" y2="{_number(top + plot_h + 7)}"/>')
+        body.append(_text(center, top + plot_h + tick_size + 8, label, tick_size, anchor='end', rotate=-45))
+
+    body.append(f'<rect class="axis" x="{left}" y="{top}" width="{_number(plot_w)}" height="{_number(plot_h)}"/>')
+    body.append(_text(left + plot_w / 2, height - 15, xlabel, tick_size))
+    body.append(_text(30, top + plot_h / 2, ylabel, tick_size, rotate=-90))
+    return _document(width, height, body), width, height
+
+
+def _line_panel(body, left, top, width, height, title, labels, values, flagged):
+    """One small-multiple panel: RPE line with markers, rings on flagged points"""
+    tick_size = 8 * PX_PER_PT
+    drop = _label_drop(labels, tick_size)
+    plot_left, plot_top = left + 70, top + 45
+    plot_w = width - 90
+    plot_h = height - 45 - drop - 45
+
+    body.append(_text(plot_left + plot_w / 2, top + 30, title, 10 * PX_PER_PT))
+    _y_axis(body, plot_left, plot_top, plot_w, plot_h, 10, tick_size, grid=True)
+
+    n = len(values)
+    pad = plot_w * 0.05
+    step = (plot_w - 2 * pad) / (n - 1) if n > 1 else 0
+    xs = [plot_left + pad + i * step if n > 1 else plot_left + plot_w / 2 for i in range(n)]
+
+    for x, label in zip(xs, labels):
+        body.append(f'<line class="grid" x1="{_number(x)}" y1="{plot_top}" x2="{_number(x)}" '
+                    f'y2="{_number(plot_top + plot_h)}"/>')
+        body.append(_text(x, plot_top + plot_h + tick_size + 6, label, tick_size, anchor='end', rotate=-45))
+
+    # Missing sessions break the line, as they do in matplotlib
+    points = [(x, plot_top + plot_h - min(v, 10) / 10 * plot_h) if not math.isnan(v) else None
+              for x, v in zip(xs, values)]
+    segment = []
+    for point in points + [None]:
+        if point is not None:
+            segment.append(f"{_number(point[0])},{_number(point[1])}")
+        elif segment:
+            if len(segment) > 1:
+                body.append(f'<polyline class="line" points="{" ".join(segment)}"/>')
+            segment = []
+    for point, flag in zip(points, flagged):
+        if point is None:
+            continue
+        body.append(f'<circle class="marker" cx="{_number(point[0])}" cy="{_number(point[1])}" r="6"/>')
+        if flag:
+            body.append(f'<circle class="alert" cx="{_number(point[0])}" cy="{_number(point[1])}" r="12"/>')
+
+    body.append(f'<rect class="axis" x="{plot_left}" y="{plot_top}" width="{_number(plot_w)}" height="{_number(plot_h)}"/>')
+    body.append(_text(plot_left + plot_w / 2, top + height - 12, 'Session', tick_size))
+    body.append(_text(left + 18, plot_top + plot_h / 2, 'RPE', tick_size, rotate=-90))
+
+
+def line_grid(titles, labels, rows, flagged, title, cols=4, panel_width=600, panel_height=450):
+    """Small multiples: one RPE line per title, cols panels per row. Returns (svg, width, height)"""
+    header = 80
+    grid_rows = (len(titles) + cols - 1) // cols
+    width, height = cols * panel_width, header + grid_rows * panel_height
+
+    body = [f'<style>.line{{stroke:{LINE_COLOR};stroke-width:4;fill:none;stroke-linejoin:round}}'
+            f'.marker{{fill:{LINE_COLOR}}}'
+            f'.alert{{fill:none;stroke:{ALERT_COLOR};stroke-width:4}}</style>',
+            _text(width / 2, 50, title, 14 * PX_PER_PT)]
+    for i, (panel_title, values, flags) in enumerate(zip(titles, rows, flagged)):
+        row, col = divmod(i, cols)
+        _line_panel(body, col * panel_width, header + row * panel_height, panel_width, panel_height,
+                    panel_title, labels, values, flags)
+    return _document(width, height, body), width, height
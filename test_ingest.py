@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Ingest behaviour checks, run by CI after the import check:
+
+    python test_ingest.py
+"""
+
+import pandas as pd
+
+import ingest
+
+
+def responses(*rows):
+    return pd.DataFrame(rows, columns=['Timestamp', 'Todays Date', 'Morning or Afternoon Session',
+                                       'Player Name', 'What is your rate of perceived exertion?', 'SessionKey'])
+
+
+def test_mojibake_session_keys():
+    for key in ['2025-08-05 – Morning', '2025-08-05 â\x80\x93 Morning', '2025-08-05 â€“ Morning']:
+        match = ingest.SESSION_KEY_PATTERN.match(key)
+        assert match and match.groups() == ('2025-08-05', 'Morning'), key
+
+    clean, rejected = ingest.normalize_responses(responses(
+        ['8/5/2025 9:00:00', None, None, '7 Sam Reed', 6, '2025-08-05 â\x80\x93 Morning'],
+        ['8/5/2025 15:00:00', None, None, '9 Ali Cole', 5, '2025-08-05 â€“ Afternoon'],
+    ))
+    assert rejected.empty
+    assert clean['session_key'].tolist() == ['2025-08-05 – Morning', '2025-08-05 – Afternoon']
+
+
+def test_player_names_fold_onto_most_common_spelling():
+    clean, _ = ingest.normalize_responses(responses(
+        ['8/5/2025 9:00:00', None, None, '7 Sam Reed', 6, '2025-08-05 – Morning'],
+        ['8/5/2025 15:00:00', None, None, ' 7  sam reed', 5, '2025-08-05 – Afternoon'],
+        ['8/6/2025 9:00:00', None, None, '7 Sam Reed', 4, '2025-08-06 – Morning'],
+    ))
+    assert clean['player'].tolist() == ['7 Sam Reed'] * 3
+
+
+def test_out_of_range_and_non_numeric_rpe_are_told_apart():
+    clean, rejected = ingest.normalize_responses(responses(
+        ['8/5/2025 9:00:00', None, None, '7 Sam Reed', 11, '2025-08-05 – Morning'],
+        ['8/5/2025 9:00:00', None, None, '9 Ali Cole', 'hard', '2025-08-05 – Morning'],
+        ['8/5/2025 9:00:00', None, None, '4 Jo Park', 0, '2025-08-05 – Morning'],
+    ))
+    assert clean['player'].tolist() == ['4 Jo Park']
+    assert dict(zip(rejected['player'], rejected['reason'])) == {
+        '7 Sam Reed': 'RPE out of range',
+        '9 Ali Cole': 'non-numeric RPE',
+    }
+
+
+def test_resubmission_keeps_latest_timestamp():
+    clean, rejected = ingest.normalize_responses(responses(
+        ['8/5/2025 11:00:00', None, None, '7 Sam Reed', 8, '2025-08-05 – Morning'],
+        ['8/5/2025 9:00:00', None, None, '7 Sam Reed', 3, '2025-08-05 – Morning'],
+    ))
+    assert clean['rpe'].tolist() == [8]
+    assert rejected['reason'].tolist() == ['duplicate submission']
+    assert rejected['rpe'].tolist() == [3]
+
+
+if __name__ == '__main__':
+    tests = [(name, test) for name, test in globals().items() if name.startswith('test_')]
+    for name, test in tests:
+        test()
+        print(f"✅ {name}")
+    print(f"✅ {len(tests)} ingest checks passed")